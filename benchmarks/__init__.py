@@ -0,0 +1,4 @@
+# author: Kaan Eraslan
+# license: see, LICENSE
+# purpose: benchmarks of suite, run from repository root with
+# python -m benchmarks.<module>
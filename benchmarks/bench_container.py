@@ -0,0 +1,95 @@
+# author: Kaan Eraslan
+# license: see, LICENSE
+# purpose: benchmark containers
+
+import time
+
+from suite.dtype.primitive import ConstantString
+from suite.dtype.primitive import PrimitiveMaker
+from suite.dtype.container import Array
+from suite.dtype.container import Pair
+
+from benchmarks.common import timeit
+from benchmarks.common import bytes_per_object
+
+
+class DictHashConstantString(ConstantString):
+    "constant string hashed over its empty instance dict like it used to be"
+
+    def __hash__(self):
+        items = list(self.__dict__.items())
+        items.sort()
+        return hash(tuple(items))
+
+
+def membership(arr: Array, primitives: list) -> None:
+    "look every primitive up in array elements"
+    for primitive in primitives:
+        primitive in arr.elements
+
+
+def bench_array_hash(sizes=(10**3, 5 * 10**3, 10**5), dict_limit=5 * 10**3):
+    "compare array construction and membership with both hashes"
+    print("array construction and membership")
+    print("size".rjust(8), "hash".rjust(8), "construct (s)".rjust(14),
+          "membership (s)".rjust(15))
+    for size in sizes:
+        for name, primitiveType in [("dict", DictHashConstantString),
+                                    ("value", ConstantString)]:
+            if name == "dict" and size > dict_limit:
+                print(str(size).rjust(8), name.rjust(8),
+                      "skipped".rjust(14), "skipped".rjust(15))
+                continue
+            primitives = [primitiveType("sample-word-" + str(i))
+                          for i in range(size)]
+            start = time.perf_counter()
+            arr = Array(primitives)
+            construct = time.perf_counter() - start
+            member = timeit(membership, arr, primitives)
+            print(str(size).rjust(8), name.rjust(8),
+                  "{0:.4f}".format(construct).rjust(14),
+                  "{0:.4f}".format(member).rjust(15))
+
+
+def bench_container_memory(size: int = 10**5):
+    "report bytes per pair and per two element array"
+    maker = PrimitiveMaker("non numeric string")
+    primitives = [maker.from_string("sample-word-" + str(i))
+                  for i in range(size + 1)]
+    print("memory of", size, "containers, members excluded")
+    print("Pair (bytes):".ljust(24), "{0:.1f}".format(bytes_per_object(
+        lambda i: Pair(arg1=primitives[i], arg2=primitives[i].cstr), size)))
+    print("Array (bytes):".ljust(24), "{0:.1f}".format(bytes_per_object(
+        lambda i: Array([primitives[i], primitives[i + 1]]), size)))
+
+
+def triple_pass_array(iterable) -> frozenset:
+    "array construction that iterates its input three times"
+    eltypes = set()
+    for item in iterable:
+        eltypes.add(type(item))
+    if len(eltypes) > 1:
+        raise ValueError("Iterable contains different types")
+    if all([el.isValid() for el in iterable]) is False:
+        raise ValueError("Array contains invalid objects")
+    return frozenset(iterable)
+
+
+def bench_array_construction(size: int = 10**6):
+    "compare three pass and single pass array construction"
+    maker = PrimitiveMaker("non numeric string")
+    primitives = [maker.from_string("sample-word-" + str(i))
+                  for i in range(size)]
+    print("array construction of", size, "elements")
+    print("three pass, list (s):".ljust(28),
+          "{0:.4f}".format(timeit(triple_pass_array, primitives)))
+    print("single pass, list (s):".ljust(28),
+          "{0:.4f}".format(timeit(Array, primitives)))
+    print("single pass, generator (s):".ljust(28),
+          "{0:.4f}".format(timeit(Array, (p for p in primitives))))
+
+
+if __name__ == "__main__":
+    bench_array_hash()
+    bench_container_memory()
+    bench_array_construction()
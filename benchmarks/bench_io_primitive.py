@@ -0,0 +1,115 @@
+# author: Kaan Eraslan
+# license: see, LICENSE
+# purpose: benchmark io of primitives
+
+import json
+
+import dill
+
+from suite.dtype.primitive import PrimitiveMaker
+from suite.io.iprimitive import ConstantStringIo
+from suite.io.iprimitive import NonNumericStringIo
+from suite.io.iprimitive import ConstraintStringIo
+from suite.io.iprimitive import load_constraint
+
+from benchmarks.common import timeit
+
+
+class RoundTripJsonIo(NonNumericStringIo.JsonIo):
+    "json io that renders constant strings through a json string"
+
+    @classmethod
+    def constant_string_to_dict(cls, conststr):
+        consio = ConstantStringIo(conststr.cstr)
+        jstr = consio.getIoInstance("json").to_json()
+        return json.loads(jstr)
+
+
+def render_dicts(iocls, primitives: list) -> None:
+    "render all primitives as dicts"
+    for primitive in primitives:
+        iocls(primitive).to_dict()
+
+
+def render_jsons(iocls, primitives: list) -> None:
+    "render all primitives as json strings"
+    for primitive in primitives:
+        iocls(primitive).to_json()
+
+
+def bench_non_numeric_string_io(size: int = 10**5):
+    "compare rendering with and without json round trip of values"
+    maker = PrimitiveMaker("non numeric string")
+    primitives = [maker.from_string("sample-word-" + str(i))
+                  for i in range(size)]
+    print("rendering of", size, "non numeric strings")
+    print("io".rjust(12), "to_dict (s)".rjust(14), "to_json (s)".rjust(14))
+    for name, iocls in [("round trip", RoundTripJsonIo),
+                        ("direct", NonNumericStringIo.JsonIo)]:
+        print(name.rjust(12),
+              "{0:.4f}".format(timeit(render_dicts, iocls,
+                                      primitives)).rjust(14),
+              "{0:.4f}".format(timeit(render_jsons, iocls,
+                                      primitives)).rjust(14))
+
+
+def export_size(pdicts: list) -> int:
+    "size of exported dicts in bytes"
+    return len(json.dumps(pdicts, ensure_ascii=False).encode("utf-8"))
+
+
+def bench_constraint_reference(size: int = 10**4):
+    "compare export size with embedded and named constraints"
+    maker = PrimitiveMaker("non numeric string")
+    primitives = [maker.from_string("sample-word-" + str(i))
+                  for i in range(size)]
+    named = [NonNumericStringIo.JsonIo(p).to_dict() for p in primitives]
+    payload = dill.dumps(primitives[0].fn).hex()
+    embedded = []
+    for pdict in named:
+        pdict = dict(pdict)
+        del pdict["constraint_name"]
+        pdict["constraint"] = payload
+        embedded.append(pdict)
+    print("export of", size, "non numeric strings")
+    print("embedded constraint (bytes):".ljust(32), export_size(embedded))
+    print("named constraint (bytes):".ljust(32), export_size(named))
+
+
+def load_payloads(payloads: list) -> None:
+    "unpickle every payload"
+    for payload in payloads:
+        dill.loads(bytes.fromhex(payload))
+
+
+def load_constraint_strings(pdicts: list) -> None:
+    "load constraint strings from dicts"
+    jio = ConstraintStringIo.getIoClass("json")
+    for pdict in pdicts:
+        jio.from_dict(pdict)
+
+
+def bench_constraint_cache(size: int = 10**5):
+    "compare unpickling each legacy payload with the constraint cache"
+    def lowercase(myx) -> bool:
+        return myx.constr.islower()
+
+    payload = dill.dumps(lowercase).hex()
+    pdicts = [{"class": "ConstraintString", "type": "primitive",
+               "constraint": payload,
+               "value": {"class": "ConstantString", "type": "primitive",
+                         "value": "sample word " + str(i)}}
+              for i in range(size)]
+    print("loading of", size, "constraint payloads")
+    print("dill per value (s):".ljust(28),
+          "{0:.4f}".format(timeit(load_payloads, [payload] * size)))
+    load_constraint.cache_clear()
+    print("from_dict, cached (s):".ljust(28),
+          "{0:.4f}".format(timeit(load_constraint_strings, pdicts)))
+    print(load_constraint.cache_info())
+
+
+if __name__ == "__main__":
+    bench_non_numeric_string_io()
+    bench_constraint_reference()
+    bench_constraint_cache()
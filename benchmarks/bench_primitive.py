@@ -0,0 +1,121 @@
+# author: Kaan Eraslan
+# license: see, LICENSE
+# purpose: benchmark primitives
+
+from fractions import Fraction
+
+from suite.dtype.primitive import ConstantString
+from suite.dtype.primitive import isNonNumericText
+from suite.dtype.primitive import nonNumeric
+from suite.dtype.primitive import PrimitiveMaker
+from suite.dtype.primitive import get_invalid_utf8_indices
+
+from benchmarks.common import timeit
+
+
+def exception_chain_non_numeric(myx: ConstantString) -> bool:
+    "non numeric check that tries every numeric type in turn"
+    x = myx.constr
+    try:
+        mystr = int(x)
+    except ValueError:
+        try:
+            mystr = float(x)
+        except ValueError:
+            try:
+                mystr = Fraction(x)
+            except ValueError:
+                try:
+                    mystr = complex(x)
+                except ValueError:
+                    mystr = x
+    return not isinstance(mystr, (float, int, complex, Fraction))
+
+
+def mk_ids(size: int) -> list:
+    "make realistic authority ids, a few of them repeated or numeric"
+    ids = []
+    for i in range(size):
+        if i % 100 == 0:
+            ids.append(ConstantString(str(i)))
+        elif i % 3 == 0:
+            ids.append(ConstantString("sample-relation-" + str(i % 50)))
+        else:
+            ids.append(ConstantString("sample-word-" + str(i)))
+    return ids
+
+
+def classify(fn, ids: list) -> None:
+    "classify all ids with given function"
+    for myx in ids:
+        fn(myx)
+
+
+def bench_non_numeric(size: int = 10**6):
+    "compare non numeric classifiers over given number of ids"
+    ids = mk_ids(size)
+    isNonNumericText.cache_clear()
+    print("non numeric classification of", size, "ids")
+    print("exception chain (s):".ljust(24),
+          "{0:.4f}".format(timeit(classify, exception_chain_non_numeric,
+                                  ids)))
+    print("nonNumeric (s):".ljust(24),
+          "{0:.4f}".format(timeit(classify, nonNumeric, ids)))
+    print(isNonNumericText.cache_info())
+
+
+def make_one_by_one(strings: list) -> list:
+    "make non numeric strings with one from_string call per string"
+    pmaker = PrimitiveMaker("non numeric string")
+    made = []
+    for mystr in strings:
+        try:
+            made.append(pmaker.from_string(mystr))
+        except ValueError:
+            pass
+    return made
+
+
+def bench_bulk_construction(size: int = 10**6):
+    "compare per string and bulk construction of non numeric strings"
+    strings = [myx.constr for myx in mk_ids(size)]
+    pmaker = PrimitiveMaker("non numeric string")
+    print("non numeric string construction of", size, "strings")
+    PrimitiveMaker.pool.clear()
+    print("from_string (s):".ljust(24),
+          "{0:.4f}".format(timeit(make_one_by_one, strings)))
+    PrimitiveMaker.pool.clear()
+    print("from_strings (s):".ljust(24),
+          "{0:.4f}".format(timeit(pmaker.from_strings, strings)))
+
+
+def round_trip_invalid_indices(strings: list) -> list:
+    "utf-8 check that encodes and decodes each string"
+    invalid = []
+    for i, mystr in enumerate(strings):
+        try:
+            check = mystr.encode("utf-8").decode("utf-8") == mystr
+        except UnicodeEncodeError:
+            check = False
+        if not check:
+            invalid.append(i)
+    return invalid
+
+
+def bench_utf8_validity(size: int = 10**6):
+    "compare per string and batch utf-8 validity checks"
+    strings = [myx.constr + " ğüşçö" for myx in mk_ids(size)]
+    print("utf-8 validity of", size, "strings")
+    print("round trip (s):".ljust(24),
+          "{0:.4f}".format(timeit(round_trip_invalid_indices, strings)))
+    print("batch (s):".ljust(24),
+          "{0:.4f}".format(timeit(get_invalid_utf8_indices, strings)))
+    strings[size // 2] = "\ud800"
+    print("batch, one invalid (s):".ljust(24),
+          "{0:.4f}".format(timeit(get_invalid_utf8_indices, strings)))
+
+
+if __name__ == "__main__":
+    bench_non_numeric()
+    bench_bulk_construction()
+    bench_utf8_validity()
@@ -0,0 +1,73 @@
+# author: Kaan Eraslan
+# license: see, LICENSE
+# purpose: benchmark structures
+
+from suite.dtype.primitive import PrimitiveMaker
+from suite.dtype.container import Array
+from suite.structure import SimpleStructure
+from suite.structure import CombinedStructure
+from suite.structure import LinkStructure
+from suite.structure import SimpleAuthorityTable
+
+from benchmarks.common import bytes_per_object
+
+
+def bench_structure_memory(size: int = 10**5):
+    "report bytes per structure, members excluded"
+    maker = PrimitiveMaker("non numeric string")
+    primitives = [maker.from_string("sample-word-" + str(i))
+                  for i in range(size)]
+    value = "sample value"
+    definition = "sample definition"
+    id2 = maker.from_string("sample-relation")
+    values = Array(primitives[:3])
+    print("memory of", size, "structures, members excluded")
+    print("SimpleStructure (bytes):".ljust(28), "{0:.1f}".format(
+        bytes_per_object(
+            lambda i: SimpleStructure(primitives[i], value, definition),
+            size)))
+    print("CombinedStructure (bytes):".ljust(28), "{0:.1f}".format(
+        bytes_per_object(
+            lambda i: CombinedStructure(primitives[i], value, definition,
+                                        id2, values),
+            size)))
+    print("LinkStructure (bytes):".ljust(28), "{0:.1f}".format(
+        bytes_per_object(
+            lambda i: LinkStructure(primitives[i], frozenset()), size)))
+
+
+def mk_simple_document(size: int) -> dict:
+    "make simple authority document with given number of entries"
+    return {
+        "sample-word-" + str(i): {"value " + str(i): "definition " + str(i)}
+        for i in range(size)
+    }
+
+
+def structures_from_dict(document: dict) -> list:
+    "make one simple structure per entry of document"
+    maker = PrimitiveMaker("non numeric string")
+    structures = []
+    for idstr, entry in document.items():
+        for value, definition in entry.items():
+            structures.append(SimpleStructure(maker.from_string(idstr),
+                                              value, definition))
+    return structures
+
+
+def bench_simple_authority_table(size: int = 10**5):
+    "compare memory of simple structures and columnar table of a document"
+    document = mk_simple_document(size)
+    print("memory of simple authority document with", size, "entries")
+    PrimitiveMaker.pool.clear()
+    print("SimpleStructure list (bytes):".ljust(32), "{0:.1f}".format(
+        bytes_per_object(lambda i: structures_from_dict(document), 1)))
+    PrimitiveMaker.pool.clear()
+    print("SimpleAuthorityTable (bytes):".ljust(32), "{0:.1f}".format(
+        bytes_per_object(
+            lambda i: SimpleAuthorityTable.from_dict(document), 1)))
+
+
+if __name__ == "__main__":
+    bench_structure_memory()
+    bench_simple_authority_table()
@@ -0,0 +1,85 @@
+# author: Kaan Eraslan
+# license: see, LICENSE
+# purpose: benchmark validation of asset documents
+
+from suite import validator as vd
+
+from benchmarks.common import timeit
+
+
+def mk_predicate_document(size: int):
+    "make predicate document with given number of entries and its ids"
+    document = {}
+    simple_ids = []
+    for i in range(size):
+        relation = "sample-relation-" + str(i)
+        word = "sample-word-" + str(i)
+        simple_ids.append(relation)
+        simple_ids.append(word)
+        document["sample-predicate-" + str(i)] = {
+            relation: {"0": word, "1": "sample-predicate-" + str(i // 2)}
+        }
+    return document, simple_ids
+
+
+def list_validate_entity_predicate_content(entity_predicate_file: dict,
+                                           simple_combined_ids: list):
+    "list based id membership that content validation used to perform"
+    keys = list(entity_predicate_file.keys())
+    for predicate_key, predicate_value in entity_predicate_file.items():
+        for key, array_obj in predicate_value.items():
+            if key not in simple_combined_ids:
+                return [False]
+            for value in array_obj.values():
+                if value not in simple_combined_ids and value not in keys:
+                    return [False]
+    return [True]
+
+
+def bench_entity_predicate_content(sizes=(10**3, 10**4, 10**5),
+                                   list_limit=10**4):
+    "compare list and set based id membership in predicate content check"
+    print("predicate content validation")
+    print("entries".rjust(10), "list (s)".rjust(12), "set (s)".rjust(12))
+    for size in sizes:
+        document, simple_ids = mk_predicate_document(size)
+        set_time = timeit(vd.validate_entity_predicate_content,
+                          document, frozenset(simple_ids))
+        list_time = "skipped"
+        if size <= list_limit:
+            list_time = "{0:.4f}".format(
+                timeit(list_validate_entity_predicate_content,
+                       document, simple_ids))
+        print(str(size).rjust(10), list_time.rjust(12),
+              "{0:.4f}".format(set_time).rjust(12))
+
+
+def mk_combined_document(size: int) -> dict:
+    "make combined authority document with given number of entries"
+    document = {}
+    for i in range(size):
+        document["sample-combined-" + str(i)] = {
+            "value " + str(i): "definition " + str(i),
+            "sample-relation-" + str(i % 7): {
+                "0": "sample-grammar-" + str(i),
+                "1": "sample-grammar-" + str(i + 1)
+            }
+        }
+    return document
+
+
+def bench_combined_authority_structure(sizes=(10**3, 10**4, 10**5, 10**6)):
+    "time combined authority structure validation over growing documents"
+    print("combined authority structure validation")
+    print("entries".rjust(10), "total (s)".rjust(12),
+          "per entry (us)".rjust(16))
+    for size in sizes:
+        document = mk_combined_document(size)
+        total = timeit(vd.validate_combined_authority_structure, document)
+        print(str(size).rjust(10), "{0:.4f}".format(total).rjust(12),
+              "{0:.3f}".format(total / size * 10**6).rjust(16))
+
+
+if __name__ == "__main__":
+    bench_entity_predicate_content()
+    bench_combined_authority_structure()
@@ -0,0 +1,25 @@
+# author: Kaan Eraslan
+# license: see, LICENSE
+# purpose: helpers shared by benchmarks
+
+import time
+import tracemalloc
+
+
+def timeit(fn, *args, **kwargs) -> float:
+    "time a single call of given function in seconds"
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def bytes_per_object(make, size: int) -> float:
+    "average bytes allocated by each of size objects made by make(i)"
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objects = [make(i) for i in range(size)]
+    total = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    # the list holding the objects is not part of their size
+    total -= objects.__sizeof__()
+    return total / size
@@ -6,6 +6,7 @@ This module contains containers of the suite
 
 from suite.dtype.primitive import ConstraintString, NonNumericString
 from suite.dtype.primitive import ConstantString
+from suite.dtype.immutable import CachedHash
 from typing import NamedTuple
 from collections import namedtuple
 from types import FunctionType
@@ -14,6 +15,8 @@ from types import FunctionType
 class BasePair:
     "Abstract class for all pairs in spec container"
 
+    __slots__ = ()
+
     def __iter__(self):
         "Make a pair iterable"
         return iter(set((self.arg1, self.arg2)))
@@ -36,10 +39,18 @@ class BasePair:
             return not res
         return NotImplemented
 
+    def hashKey(self) -> tuple:
+        "values that decide equality of pair"
+        raise NotImplementedError
+
     def __hash__(self):
-        items = list(self.__dict__.items())
-        items.sort()
-        return hash(tuple(items))
+        """
+        hash of pair values
+
+        Pairs have no instance dict to keep a hash in, members keep their
+        own hashes so hashing a pair stays cheap.
+        """
+        return hash(self.hashKey())
 
     def __eq_proc__(self, other):
         cond1 = other.arg1 == self.arg1
@@ -48,56 +59,78 @@ class BasePair:
 
 
 class Pair(BasePair, namedtuple("Pair", "arg1 arg2")):
+    __slots__ = ()
+
     def __eq__(self, other):
         if isinstance(other, Pair):
             return self.__eq_proc__(other)
         return NotImplemented
 
+    def hashKey(self) -> tuple:
+        return ("Pair", self.arg1, self.arg2)
+
+    def __getnewargs__(self):
+        "keep argument order, iterating a pair goes over an unordered set"
+        return (self.arg1, self.arg2)
+
     def __hash__(self):
-        items = list(self.__dict__.items())
-        items.sort()
-        return hash(tuple(items))
+        return BasePair.__hash__(self)
+
 
+class Array(CachedHash):
+    "Models array container from spec, immutable once initialized"
 
-class Array:
-    "Models array container from spec"
+    __slots__ = ("elements", "_hash")
 
     def __init__(self, iterable):
-        ""
-        check = True
+        """
+        Make array from iterable in a single pass
+
+        Any iterable, including generators, is accepted. Once an invalid
+        element is seen, elements are no longer collected, the rest are
+        only checked so that every invalid element can be reported.
+        """
         try:
             iterator = iter(iterable)
         except TypeError:
-            check = False
-        #
-        if check is False:
             raise TypeError(
                 "Provided object should be an iterable. It is of type: "
                 + str(type(iterable))
             )
-        firstElement = None
-        eltypes = set()
-        for item in iterable:
-            eltypes.add(type(item))
-
-        if len(eltypes) > 1:
-            mess = "Iterable contains different types: " + str(eltypes)
-
-            raise ValueError(mess)
-        validCheck = all([el.isValid() for el in iterable])
-        if validCheck is False:
+        elements = set()
+        add = elements.add
+        eltype = None
+        invalid = []
+        for item in iterator:
+            itemtype = type(item)
+            if eltype is None:
+                eltype = itemtype
+            elif itemtype is not eltype:
+                mess = "Iterable contains different types: "
+                raise ValueError(mess + str({eltype, itemtype}))
+            if not item.isValid():
+                invalid.append(item)
+            elif not invalid:
+                add(item)
+        if invalid:
             raise ValueError(
                 "Array contains invalid objects: "
-                + " ".join([el for el in iterable if el.isValid() is False])
+                + " ".join([str(el) for el in invalid])
             )
-        self.elements = frozenset(iterable)
+        object.__setattr__(self, "elements", frozenset(elements))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Array is immutable, can not set: " + name)
+
+    def __delattr__(self, name):
+        raise AttributeError("Array is immutable, can not delete: " + name)
 
     def isValid(self):
         "If the array is initialized that it should have been valid"
         return True
 
     def __str__(self):
-        return "Array: " + " ".join([el for el in self.elements])
+        return "Array: " + " ".join([str(el) for el in self.elements])
 
     def __eq__(self, other):
         if isinstance(other, Array):
@@ -110,10 +143,11 @@ class Array:
             return not res
         return NotImplemented
 
+    def hashKey(self) -> tuple:
+        return ("Array", self.elements)
+
     def __hash__(self):
-        items = list(self.__dict__.items())
-        items.sort()
-        return hash(tuple(items))
+        return CachedHash.__hash__(self)
 
 
 class ContainerMaker:
@@ -0,0 +1,46 @@
+"""
+This module contains helpers shared by immutable types of the suite
+"""
+# author: Kaan Eraslan
+# license: see, LICENSE
+
+
+class CachedHash:
+    """
+    Mixin for immutable objects that keep their hash once computed
+
+    Values cached on the instance, like the hash, are listed in
+    cachedAttributes. They are left out of pickled state: str hashes vary
+    by process and other cached values are derived from the fields.
+    Works for objects with an instance dict as well as with slots.
+    """
+
+    __slots__ = ()
+    cachedAttributes = ("_hash",)
+
+    def hashKey(self) -> tuple:
+        "values that decide equality of object"
+        raise NotImplementedError
+
+    def __hash__(self):
+        "hash of values computed once and kept on the instance"
+        try:
+            return self._hash
+        except AttributeError:
+            myhash = hash(self.hashKey())
+            object.__setattr__(self, "_hash", myhash)
+            return myhash
+
+    def __getstate__(self):
+        state = dict(getattr(self, "__dict__", {}))
+        for klass in type(self).__mro__:
+            for name in klass.__dict__.get("__slots__", ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        for name in self.cachedAttributes:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
@@ -4,13 +4,24 @@ This module contains primitives of the suite
 # author: Kaan Eraslan
 # license: see, LICENSE
 
+from bisect import bisect_right
+from collections import Counter
+from collections import OrderedDict
 from fractions import Fraction
+from functools import lru_cache
+from itertools import accumulate
+import re
 
 from typing import NamedTuple
 from types import FunctionType
 
+from suite.dtype.immutable import CachedHash
 
-class BasePrimitive:
+# number of validations actually run for each primitive type
+VALIDATION_COUNTS = Counter()
+
+
+class BasePrimitive(CachedHash):
     "Base class for all primitives"
 
     def __ne__(self, other):
@@ -19,10 +30,63 @@ class BasePrimitive:
             return not res
         return NotImplemented
 
-    def __hash__(self):
-        items = list(self.__dict__.items())
-        items.sort()
-        return hash(tuple(items))
+    def isValidated(self) -> bool:
+        "check if primitive carries the proof of a successful validation"
+        return self.__dict__.get("_valid", False)
+
+    def isValid(self):
+        """
+        Check if primitive is valid
+
+        Primitives are immutable, so a successful validation is recorded on
+        the instance and later calls return without validating again.
+        Subclasses implement the actual check in checkValidity.
+        """
+        if self.__dict__.get("_valid", False):
+            return True
+        VALIDATION_COUNTS[self.__class__.__name__] += 1
+        check = self.checkValidity()
+        if check:
+            self.__dict__["_valid"] = True
+        return check
+
+
+def get_validation_counts() -> dict:
+    "get number of validations run for each primitive type"
+    return dict(VALIDATION_COUNTS)
+
+
+def reset_validation_counts() -> None:
+    "reset validation counters of primitives"
+    VALIDATION_COUNTS.clear()
+
+
+# a str can be encoded as utf-8 unless it contains surrogate code points
+SURROGATE_CHAR = re.compile("[\ud800-\udfff]")
+
+
+def get_invalid_utf8_indices(strings: list) -> list:
+    """
+    get indices of strings that can not be encoded as utf-8
+
+    The whole batch is encoded at once. Only if that fails, surrogates are
+    searched in the joined batch and their offsets are mapped back to the
+    indices of strings. Non str items are skipped.
+    """
+    texts = [mystr if isinstance(mystr, str) else "" for mystr in strings]
+    joined = "".join(texts)
+    try:
+        joined.encode("utf-8")
+        return []
+    except UnicodeEncodeError:
+        pass
+    ends = list(accumulate(map(len, texts)))
+    invalid = []
+    for match in SURROGATE_CHAR.finditer(joined):
+        index = bisect_right(ends, match.start())
+        if not invalid or invalid[-1] != index:
+            invalid.append(index)
+    return invalid
 
 
 class ConstantStringBase(NamedTuple):
@@ -31,16 +95,9 @@ class ConstantStringBase(NamedTuple):
 
 
 class ConstantString(BasePrimitive, ConstantStringBase):
-    def isValid(self):
+    def checkValidity(self):
         "Check if constant string is valid"
-        check = True
-        try:
-            mybyte = self.constr.encode("utf-8")
-            mystr = mybyte.decode("utf-8")
-            check = mystr == self.constr
-        except UnicodeDecodeError or UnicodeEncodeError:
-            check = False
-        return check
+        return SURROGATE_CHAR.search(self.constr) is None
 
     def __repr__(self):
         return "string: " + str(self) + " of type: " + self.__class__.__name__
@@ -49,6 +106,8 @@ class ConstantString(BasePrimitive, ConstantStringBase):
         return self.constr
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, ConstantString):
             cond1 = other.constr == self.constr
             return cond1
@@ -57,17 +116,18 @@ class ConstantString(BasePrimitive, ConstantStringBase):
     def __copy__(self):
         return ConstantString(constr=self.constr)
 
+    def hashKey(self) -> tuple:
+        return ("ConstantString", self.constr)
+
     def __hash__(self):
-        items = list(self.__dict__.items())
-        items.sort()
-        return hash(tuple(items))
+        return BasePrimitive.__hash__(self)
 
 
 class ConstraintStringBase(NamedTuple):
     cstr: ConstantString
     fn: FunctionType
 
-    def isValid(self):
+    def checkValidity(self):
         "Is string valid for given constraint"
         return self.fn(self.cstr)
 
@@ -80,6 +140,8 @@ class ConstraintStringBase(NamedTuple):
         return mess
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, ConstraintString):
             cond1 = other.cstr == self.cstr
             cond2 = other.fn.__name__ == self.fn.__name__
@@ -91,14 +153,24 @@ class ConstraintString(BasePrimitive, ConstraintStringBase):
     def __copy__(self):
         return ConstraintString(cstr=self.cstr, fn=self.fn)
 
+    def hashKey(self) -> tuple:
+        return ("ConstraintString", self.cstr, self.fn.__name__)
+
     def __hash__(self):
-        items = list(self.__dict__.items())
-        items.sort()
-        return hash(tuple(items))
+        return BasePrimitive.__hash__(self)
 
 
-def nonNumeric(myx: ConstantString) -> bool:
-    x = myx.constr
+# int, float, Fraction and complex only accept decimal digits, whitespace,
+# signs, separators, exponent, imaginary unit and the letters of inf,
+# infinity and nan. A string with any other character is non numeric.
+NON_NUMERIC_CHAR = re.compile(r"[^\d\s+\-._/()eEjJiInNfFaAtTyY]")
+
+
+@lru_cache(maxsize=2**16)
+def isNonNumericText(x: str) -> bool:
+    "check if text can not be evaluated as a numeric expression"
+    if NON_NUMERIC_CHAR.search(x) is not None:
+        return True
     try:
         mystr = int(x)
     except ValueError:
@@ -115,6 +187,51 @@ def nonNumeric(myx: ConstantString) -> bool:
     return not isinstance(mystr, (float, int, complex, Fraction))
 
 
+def nonNumeric(myx: ConstantString) -> bool:
+    return isNonNumericText(myx.constr)
+
+
+# constraint functions by the name used to reference them in serialized
+# primitives, and the reverse lookup
+CONSTRAINTS = {}
+CONSTRAINT_NAMES = {}
+
+
+def register_constraint(fn: FunctionType, name: str = None) -> str:
+    "register constraint function under name, function name by default"
+    if not isinstance(fn, FunctionType):
+        raise TypeError(
+            "Incompatible type: " + type(fn).__name__
+            + ". Only FunctionType type is allowed"
+        )
+    if name is None:
+        name = fn.__name__
+    if name == "<lambda>":
+        raise ValueError("Anonymous functions are not allowed.")
+    registered = CONSTRAINTS.get(name)
+    if registered is not None and registered is not fn:
+        raise ValueError("Another constraint is registered as: " + name)
+    CONSTRAINTS[name] = fn
+    CONSTRAINT_NAMES[fn] = name
+    return name
+
+
+def get_constraint(name: str) -> FunctionType:
+    "get constraint function registered under name"
+    fn = CONSTRAINTS.get(name)
+    if fn is None:
+        raise ValueError("Unknown constraint: " + str(name))
+    return fn
+
+
+def get_constraint_name(fn: FunctionType):
+    "get name of registered constraint function or None"
+    return CONSTRAINT_NAMES.get(fn)
+
+
+register_constraint(nonNumeric)
+
+
 class NonNumericStringBase(NamedTuple):
     cstr: ConstantString
 
@@ -122,7 +239,7 @@ class NonNumericStringBase(NamedTuple):
     def fn(self):
         return nonNumeric
 
-    def isValid(self):
+    def checkValidity(self):
         "Is string valid for given constraint"
         return self.fn(self.cstr)
 
@@ -139,6 +256,8 @@ class NonNumericString(NonNumericStringBase, BasePrimitive):
     "Models spec primitive Non Numeric String"
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, NonNumericString):
             cond1 = other.cstr == self.cstr
             cond2 = other.fn.__name__ == self.fn.__name__
@@ -148,14 +267,62 @@ class NonNumericString(NonNumericStringBase, BasePrimitive):
     def __copy__(self):
         return NonNumericString(cstr=self.cstr, fn=self.fn)
 
+    def hashKey(self) -> tuple:
+        return ("NonNumericString", self.cstr)
+
     def __hash__(self):
-        items = list(self.__dict__.items())
-        items.sort()
-        return hash(tuple(items))
+        return BasePrimitive.__hash__(self)
+
+    def isValid(self):
+        return BasePrimitive.isValid(self)
+
+
+class PrimitivePool:
+    """
+    Bounded pool of interned primitives
+
+    Primitives are immutable, so the same instance can be shared by every
+    occurrence of the same string and constraint. Primitives are tuples
+    which can not be weakly referenced, hence the pool is bounded and
+    evicts the least recently used primitive instead.
+    """
+
+    def __init__(self, maxsize: int = 2**16):
+        self.maxsize = maxsize
+        self.primitives = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple):
+        "get interned primitive for key or None"
+        primitive = self.primitives.get(key)
+        if primitive is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.primitives.move_to_end(key)
+        return primitive
+
+    def add(self, key: tuple, primitive):
+        "intern primitive under key"
+        self.primitives[key] = primitive
+        if len(self.primitives) > self.maxsize:
+            self.primitives.popitem(last=False)
+        return primitive
+
+    def clear(self):
+        "remove all interned primitives and reset counters"
+        self.primitives.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.primitives)
 
 
 class PrimitiveMaker:
     ""
+    pool = PrimitivePool()
 
     def __init__(self, choice: str):
         self.choice = choice
@@ -166,10 +333,35 @@ class PrimitiveMaker:
         mess += ". Only str type is allowed"
         if not isinstance(mystr, str):
             raise TypeError(mess)
+        key = ("ConstantString", mystr)
+        constr = cls.pool.get(key)
+        if constr is not None:
+            return constr
         constr = ConstantString(constr=mystr)
         if not constr.isValid():
             raise ValueError("Not valid ConstantString: " + str(constr))
-        return constr
+        return cls.pool.add(key, constr)
+
+    @classmethod
+    def _make_checked_constant_string(cls, mystr: str):
+        """
+        make constant string of a str that passed the batch utf-8 check
+
+        Only _make_from_strings calls this, after get_invalid_utf8_indices
+        has excluded mystr, so the validation is recorded without being
+        run again.
+        """
+        mess = "Incompatible type: " + type(mystr).__name__
+        mess += ". Only str type is allowed"
+        if not isinstance(mystr, str):
+            raise TypeError(mess)
+        key = ("ConstantString", mystr)
+        constr = cls.pool.get(key)
+        if constr is not None:
+            return constr
+        constr = ConstantString(constr=mystr)
+        constr.__dict__["_valid"] = True
+        return cls.pool.add(key, constr)
 
     @classmethod
     def make_constraint_string(cls, mystr: ConstantString, fnc: FunctionType):
@@ -177,18 +369,15 @@ class PrimitiveMaker:
         mess += ". Only ConstantString type is allowed"
         if not isinstance(mystr, ConstantString):
             raise TypeError(mess)
-        mess = "Incompatible type: " + type(fnc).__name__
-        mess += ". Only FunctionType type is allowed"
-        if not isinstance(fnc, FunctionType):
-            raise TypeError(mess)
-        fname = fnc.__name__
-        mess = "Anonymous functions are not allowed."
-        if not fname != "<lambda>":
-            raise ValueError(mess)
+        cls.check_constraint_function(fnc)
+        key = ("ConstraintString", mystr.constr, fnc)
+        cstr = cls.pool.get(key)
+        if cstr is not None:
+            return cstr
         cstr = ConstraintString(cstr=mystr, fn=fnc)
         if not cstr.isValid():
             raise ValueError("Invalid ConstraintString: " + str(cstr))
-        return cstr
+        return cls.pool.add(key, cstr)
 
     @classmethod
     def make_non_numeric_string(cls, mystr: ConstantString):
@@ -196,10 +385,117 @@ class PrimitiveMaker:
         mess += ". Only ConstantString type is allowed"
         if not isinstance(mystr, ConstantString):
             raise TypeError(mess)
+        key = ("NonNumericString", mystr.constr)
+        nnstr = cls.pool.get(key)
+        if nnstr is not None:
+            return nnstr
         nnstr = NonNumericString(cstr=mystr)
         if not nnstr.isValid():
             raise ValueError("Not valid NonNumericString: " + str(nnstr))
-        return nnstr
+        return cls.pool.add(key, nnstr)
+
+    @classmethod
+    def check_constraint_function(cls, fnc: FunctionType):
+        "check if function can be used as a constraint"
+        mess = "Incompatible type: " + type(fnc).__name__
+        mess += ". Only FunctionType type is allowed"
+        if not isinstance(fnc, FunctionType):
+            raise TypeError(mess)
+        fname = fnc.__name__
+        mess = "Anonymous functions are not allowed."
+        if not fname != "<lambda>":
+            raise ValueError(mess)
+
+    @classmethod
+    def _get_batch_builder(cls, choice: str, **kwargs):
+        """
+        resolve the function that makes a primitive of choice from a str
+
+        Arguments shared by all strings, like the constraint function, are
+        checked once here instead of once per string. Builders expect
+        strings that passed the batch utf-8 check of _make_from_strings.
+        """
+        choice = choice.lower()
+        pool = cls.pool
+        make_constant_string = cls._make_checked_constant_string
+        if choice == "constant string":
+            return make_constant_string
+        elif choice == "constraint string":
+            fnc = kwargs["fnc"]
+            cls.check_constraint_function(fnc)
+
+            def make_constraint_string(mystr: str):
+                cstr = pool.get(("ConstraintString", mystr, fnc))
+                if cstr is not None:
+                    return cstr
+                constr = make_constant_string(mystr)
+                cstr = ConstraintString(cstr=constr, fn=fnc)
+                if not cstr.isValid():
+                    mess = "Invalid ConstraintString: " + str(cstr)
+                    raise ValueError(mess)
+                return pool.add(("ConstraintString", mystr, fnc), cstr)
+
+            return make_constraint_string
+        elif choice == "non numeric string":
+
+            def make_non_numeric_string(mystr: str):
+                nnstr = pool.get(("NonNumericString", mystr))
+                if nnstr is not None:
+                    return nnstr
+                constr = make_constant_string(mystr)
+                nnstr = NonNumericString(cstr=constr)
+                if not nnstr.isValid():
+                    mess = "Not valid NonNumericString: " + str(nnstr)
+                    raise ValueError(mess)
+                return pool.add(("NonNumericString", mystr), nnstr)
+
+            return make_non_numeric_string
+        else:
+            raise ValueError("Unknown primitive choice: " + choice)
+
+    @classmethod
+    def _make_from_strings(cls, choice: str, strings, **kwargs) -> tuple:
+        """
+        make primitives of choice from strings
+
+        Outputs made primitives and a list of (index, input, reason) for
+        each string that could not be made into a primitive. Strings are
+        checked for utf-8 validity as a batch, and only strings that pass
+        the check are given to the builder.
+        """
+        builder = cls._get_batch_builder(choice, **kwargs)
+        strings = list(strings)
+        invalid = set(get_invalid_utf8_indices(strings))
+        primitives = []
+        rejected = []
+        add = primitives.append
+        for index, mystr in enumerate(strings):
+            if index in invalid:
+                reason = "Not valid ConstantString: " + mystr
+                rejected.append((index, mystr, reason))
+                continue
+            try:
+                add(builder(mystr))
+            except (TypeError, ValueError) as err:
+                rejected.append((index, mystr, str(err)))
+        return primitives, rejected
+
+    def from_strings(self, strings, **kwargs) -> tuple:
+        "make objects of choice from an iterable of strings"
+        return self._make_from_strings(self.choice, strings, **kwargs)
+
+    @classmethod
+    def from_type_strings(cls, primitiveType, strings, **kwargs) -> tuple:
+        "make primitives of given type from an iterable of strings"
+        pname = primitiveType.__name__
+        choices = {
+            "ConstantString": "constant string",
+            "ConstraintString": "constraint string",
+            "NonNumericString": "non numeric string",
+        }
+        if pname not in choices:
+            raise ValueError("Unknown Primitive Type: " + pname)
+        return cls._make_from_strings(choices[pname], strings, **kwargs)
 
     def make(self, **kwargs):
         choice = self.choice.lower()
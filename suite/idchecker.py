@@ -8,6 +8,13 @@ import json
 import glob
 import sys
 
+ID_INDEX_NAME = "idindex.json"
+ID_INDEX_VERSION = 2
+DEFINING_ASSET_TYPES = ("entity", "predicate", "author", "simple")
+
+# project path to file stamps and id lookup built from them
+ID_LOOKUP_CACHE = {}
+
 
 def read_json(jsonpath: str) -> dict:
     "read json object from given path"
@@ -39,16 +46,214 @@ def build_project_structure(project_path: str):
     return structure
 
 
-def check_id_in_project(project_path: str, idstr: str) -> bool:
-    "check id string in project"
+def list_project_json_files(project_path: str):
+    "list json files of project assets together with their asset type"
     structure = build_project_structure(project_path)
     for asset_type, asset_path in structure.items():
         jsonglob = os.path.join(asset_path, "*.json")
-        jsonfiles = glob.glob(jsonglob)
+        jsonfiles = sorted(glob.glob(jsonglob))
         for jsonpath in jsonfiles:
-            if check_for_json(idstr, jsonpath):
-                return True, asset_type, jsonpath
-    return [False]
+            yield asset_type, jsonpath
+
+
+def get_id_index_path(project_path: str) -> str:
+    "get path of the id index which is stored next to assets directory"
+    return os.path.join(project_path, ID_INDEX_NAME)
+
+
+def get_file_stamp(jsonpath: str) -> list:
+    "get modification time and size of file for invalidating index entries"
+    stat = os.stat(jsonpath)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def get_project_stamps(project_path: str) -> dict:
+    "get asset type and stamp of each json file of project assets"
+    stamps = {}
+    for asset_type, jsonpath in list_project_json_files(project_path):
+        relpath = os.path.relpath(jsonpath, project_path)
+        stamps[relpath] = (asset_type, get_file_stamp(jsonpath))
+    return stamps
+
+
+def keep_keys_hook(pairs: list) -> list:
+    "object pairs hook that replaces each json object with its keys"
+    return [key for key, value in pairs]
+
+
+def read_json_ids(jsonpath: str) -> list:
+    """
+    read ids, that is top level keys, of json object from given path
+
+    Duplicated keys are kept, since json objects are never built as
+    dicts, and nested objects are reduced to their keys as soon as they
+    are parsed.
+    """
+    assert os.path.isfile(jsonpath)
+    with open(jsonpath, "r", encoding="utf-8") as fd:
+        ids = json.load(fd, object_pairs_hook=keep_keys_hook)
+    return ids
+
+
+def read_id_index(project_path: str) -> dict:
+    "read id index of project, return an empty index if it is not usable"
+    index = {"version": ID_INDEX_VERSION, "files": {}}
+    index_path = get_id_index_path(project_path)
+    if not os.path.isfile(index_path):
+        return index
+    try:
+        stored = read_json(index_path)
+    except ValueError:
+        return index
+    if stored.get("version") != ID_INDEX_VERSION:
+        return index
+    return stored
+
+
+def write_id_index(project_path: str, index: dict) -> None:
+    "write id index of project next to its assets"
+    index_path = get_id_index_path(project_path)
+    with open(index_path, "w", encoding="utf-8") as fd:
+        json.dump(index, fd, ensure_ascii=False)
+
+
+def update_id_index(project_path: str, stamps: dict = None) -> dict:
+    """
+    bring id index of project up to date with its assets
+
+    Only the files whose modification time or size differ from the stamp
+    recorded in the index are read again. Entries of removed files are
+    dropped. The index is written back only if it has changed. Stamps
+    already taken with get_project_stamps can be given to avoid a second
+    stat of each file.
+
+    index structure
+    {"version": 2,
+     "files": {"assets/link/link1.json": {"asset_type": "link",
+                                          "stamp": [mtime_ns, size],
+                                          "ids": ["entity-1", "entity-2"]}}
+     }
+    """
+    if stamps is None:
+        stamps = get_project_stamps(project_path)
+    index = read_id_index(project_path)
+    old_files = index["files"]
+    files = {}
+    changed = False
+    for relpath, (asset_type, stamp) in stamps.items():
+        entry = old_files.get(relpath)
+        if (entry is None or entry["stamp"] != stamp
+                or entry["asset_type"] != asset_type):
+            jsonpath = os.path.join(project_path, relpath)
+            entry = {"asset_type": asset_type,
+                     "stamp": stamp,
+                     "ids": read_json_ids(jsonpath)}
+            changed = True
+        files[relpath] = entry
+    if changed or len(files) != len(old_files):
+        index = {"version": ID_INDEX_VERSION, "files": files}
+        write_id_index(project_path, index)
+    return index
+
+
+def build_id_lookup(project_path: str, index: dict) -> dict:
+    "build id to locations lookup from id index"
+    lookup = {}
+    for relpath, entry in index["files"].items():
+        location = (entry["asset_type"], os.path.join(project_path, relpath))
+        for idstr in entry["ids"]:
+            if idstr in lookup:
+                lookup[idstr].append(location)
+            else:
+                lookup[idstr] = [location]
+    return lookup
+
+
+def load_id_lookup(project_path: str) -> dict:
+    """
+    load id to locations lookup of project using its id index
+
+    The lookup is kept in memory and built again only when a file of
+    project assets is added, removed or changed, so repeated checks cost
+    a stat of each file instead of reading the index and all of its ids.
+    The output is shared between calls and must not be modified.
+    """
+    stamps = get_project_stamps(project_path)
+    cached = ID_LOOKUP_CACHE.get(project_path)
+    if cached is not None and cached[0] == stamps:
+        return cached[1]
+    index = update_id_index(project_path, stamps)
+    lookup = build_id_lookup(project_path, index)
+    ID_LOOKUP_CACHE[project_path] = (stamps, lookup)
+    return lookup
+
+
+def check_id_in_lookup(lookup: dict, idstr: str):
+    "check id string in id lookup"
+    locations = lookup.get(idstr)
+    if not locations:
+        return [False]
+    asset_type, jsonpath = locations[0]
+    return True, asset_type, jsonpath
+
+
+def check_id_in_project(project_path: str, idstr: str) -> bool:
+    "check id string in project"
+    lookup = load_id_lookup(project_path)
+    return check_id_in_lookup(lookup, idstr)
+
+
+def check_ids_in_project(project_path: str, idstrs) -> dict:
+    """
+    check many id strings in project at once
+
+    Each asset file is read at most once, since the lookup is built a
+    single time for all the given ids. Output maps each id string to its
+    check result, see check_id_in_project.
+    """
+    lookup = load_id_lookup(project_path)
+    checks = {}
+    for idstr in idstrs:
+        checks[idstr] = check_id_in_lookup(lookup, idstr)
+    return checks
+
+
+def read_id_file(idpath: str) -> list:
+    "read id strings from given file, one id per line, blank lines skipped"
+    assert os.path.isfile(idpath)
+    with open(idpath, "r", encoding="utf-8") as fd:
+        idstrs = [line.strip() for line in fd]
+    return [idstr for idstr in idstrs if idstr]
+
+
+def check_id_file_in_project(project_path: str, idpath: str) -> dict:
+    "check id strings written in given file in project"
+    return check_ids_in_project(project_path, read_id_file(idpath))
+
+
+def get_duplicate_ids(lookup: dict,
+                      asset_types=DEFINING_ASSET_TYPES) -> dict:
+    "get ids that have more than one location of given asset types"
+    duplicates = {}
+    for idstr, locations in lookup.items():
+        locations = [loc for loc in locations if loc[0] in asset_types]
+        if len(locations) > 1:
+            duplicates[idstr] = locations
+    return duplicates
+
+
+def find_duplicate_ids(project_path: str) -> dict:
+    """
+    find ids that are defined more than once in project assets
+
+    Ids repeated in the same file and ids shared across files are both
+    reported. Link documents are not considered, since their keys refer to
+    entity ids instead of defining new ones. Output maps each duplicate id
+    to all of its locations
+    {"sample-word-1": [("simple", "path/to/simple.json"),
+                       ("simple", "path/to/simple.json")]}
+    """
+    return get_duplicate_ids(load_id_lookup(project_path))
 
 
 if __name__ == "__main__":
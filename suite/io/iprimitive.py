@@ -6,14 +6,29 @@ from suite.dtype.primitive import ConstraintString
 from suite.dtype.primitive import ConstantString
 from suite.dtype.primitive import NonNumericString
 from suite.dtype.primitive import PrimitiveMaker
+from suite.dtype.primitive import get_constraint
+from suite.dtype.primitive import get_constraint_name
 
+from functools import lru_cache
 from lxml import etree
+import hashlib
 import json
 import yaml
 import pickle
 import dill
 
 
+@lru_cache(maxsize=256)
+def load_constraint(payload: str):
+    """
+    load constraint function from pickled payload in hex
+
+    Files that embed the same constraint payload in every element only
+    unpickle it once. Counters are given by load_constraint.cache_info().
+    """
+    return dill.loads(bytes.fromhex(payload))
+
+
 class _PrimitiveIo:
     "Base class for all primitive io"
 
@@ -34,6 +49,54 @@ class _PrimitiveIo:
             raise ValueError(messPrefix + objval + " it must be: " + wantedVal)
         return
 
+    @classmethod
+    def constraint_to_attributes(cls, fn, payloads: dict = None) -> dict:
+        """
+        reference constraint function of a primitive
+
+        Registered constraints are referenced by their name. Other
+        constraints are pickled. If payloads of the document are given,
+        the pickled function is stored there once under its digest and
+        referenced by the digest, otherwise it is embedded.
+        """
+        name = get_constraint_name(fn)
+        if name is not None:
+            return {"constraint_name": name}
+        payload = dill.dumps(fn)
+        if payloads is None:
+            return {"constraint": payload.hex()}
+        ref = hashlib.sha256(payload).hexdigest()
+        if ref not in payloads:
+            payloads[ref] = payload.hex()
+        return {"constraint_ref": ref}
+
+    @classmethod
+    def attributes_to_constraint(cls, attrs, payloads: dict = None):
+        "get constraint function referenced by attributes of element or dict"
+        name = attrs.get("constraint_name")
+        if name is not None:
+            return get_constraint(name)
+        ref = attrs.get("constraint_ref")
+        if ref is not None:
+            if payloads is None or ref not in payloads:
+                raise ValueError("Unknown constraint reference: " + ref)
+            payload = payloads[ref]
+        else:
+            payload = attrs.get("constraint")
+            if payload is None:
+                raise ValueError("Primitive does not reference a constraint")
+        return load_constraint(payload)
+
+    @classmethod
+    def constant_string_to_dict(cls, primitive):
+        "transform constant string of a constraint string to dict"
+        return ConstantStringIo.JsonIo(primitive.cstr).to_dict()
+
+    @classmethod
+    def dict_to_constant_string(cls, consdict: dict) -> ConstantString:
+        "transform dict representation to constant string"
+        return ConstantStringIo.JsonIo.from_dict(consdict)
+
 
 class _PrimitiveXmlIo(_PrimitiveIo):
     "io primitive in xml format"
@@ -218,48 +281,49 @@ class ConstraintStringIo(_PrimitiveIoBuilder):
             maker = PrimitiveMaker("constant string")
             return maker.make(mystr=text)
 
-        def to_element(self):
+        def to_element(self, payloads: dict = None):
             "render default representation for constraint string"
             root = etree.Element("primitive")
             root.text = str(self.primitive)
             root.set("class", self.primitiveType.__name__)
-            myfn = dill.dumps(self.primitive.fn)
-            root.set("constraint", myfn.hex())
+            attrs = self.constraint_to_attributes(self.primitive.fn, payloads)
+            for key, value in attrs.items():
+                root.set(key, value)
             return root
 
-        def to_dict(self):
+        def to_dict(self, payloads: dict = None):
             "Default representation in python dict"
             pdict = {}
             pdict["class"] = self.primitiveType.__name__
-            pdict["constraint"] = dill.dumps(self.primitive.fn).hex()
+            pdict.update(
+                self.constraint_to_attributes(self.primitive.fn, payloads)
+            )
             pdict["type"] = "primitive"
             pdict["value"] = self.constant_string_to_dict(self.primitive)
             return pdict
 
         @classmethod
-        def from_element(cls, element: etree.Element):
+        def from_element(cls, element: etree.Element, payloads: dict = None):
             ""
             elclass = element.get("class")
             eltag = element.tag
             cls.check_value_error(elclass, "ConstraintString", "Given element class: ")
             cls.check_value_error(eltag, "primitive", "Given element tag: ")
 
-            myfn = bytes.fromhex(element.get("constraint"))
-            myfn = dill.loads(myfn)
+            myfn = cls.attributes_to_constraint(element, payloads)
             cstr = element.text
             constr = cls.text_to_constant_string(cstr)
             maker = PrimitiveMaker("constraint string")
             return maker.make(mystr=constr, fnc=myfn)
 
         @classmethod
-        def from_dict(cls, cdict: dict) -> ConstraintString:
+        def from_dict(cls, cdict: dict, payloads: dict = None) -> ConstraintString:
             "transform dict to ConstraintString"
             objclass = cdict.get("class", "")
             objtype = cdict.get("type", "")
             cls.check_value_error(objtype, "primitive", "Given object type: ")
             cls.check_value_error(objclass, "ConstraintString", "Given object class: ")
-            myfn = bytes.fromhex(cdict["constraint"])
-            myfnc = dill.loads(myfn)
+            myfnc = cls.attributes_to_constraint(cdict, payloads)
             constrdict = cdict["value"]
             constr = cls.dict_to_constant_string(constrdict)
             maker = PrimitiveMaker("constraint string")
@@ -271,41 +335,25 @@ class ConstraintStringIo(_PrimitiveIoBuilder):
         def __init__(self, cstr: ConstraintString):
             super().__init__(cstr, ConstraintString)
 
-        @classmethod
-        def constant_string_to_dict(cls, constring: ConstraintString):
-            "transform constant string to dict"
-            constr = constring.cstr
-            consio = ConstantStringIo(constr)
-            ionst = consio.getIoInstance("json")
-            jstr = ionst.to_json()
-            return json.loads(jstr)
-
-        def to_dict(self):
+        def to_dict(self, payloads: dict = None):
             "Default representation in python dict"
             pdict = {}
             pdict["class"] = self.primitiveType.__name__
-            pdict["constraint"] = dill.dumps(self.primitive.fn).hex()
+            pdict.update(
+                self.constraint_to_attributes(self.primitive.fn, payloads)
+            )
             pdict["type"] = "primitive"
             pdict["value"] = self.constant_string_to_dict(self.primitive)
             return pdict
 
         @classmethod
-        def dict_to_constant_string(cls, consdict: dict):
-            "transform dict representation to constant string"
-            consio = ConstantStringIo
-            iocls = consio.getIoClass("json")
-            constr = iocls.from_dict(consdict)
-            return constr
-
-        @classmethod
-        def from_dict(cls, cdict: dict) -> ConstraintString:
+        def from_dict(cls, cdict: dict, payloads: dict = None) -> ConstraintString:
             "transform dict to ConstraintString"
             objclass = cdict.get("class", "")
             objtype = cdict.get("type", "")
             cls.check_value_error(objtype, "primitive", "Given object type: ")
             cls.check_value_error(objclass, "ConstraintString", "Given object class: ")
-            myfn = bytes.fromhex(cdict["constraint"])
-            myfnc = dill.loads(myfn)
+            myfnc = cls.attributes_to_constraint(cdict, payloads)
             constrdict = cdict["value"]
             constr = cls.dict_to_constant_string(constrdict)
             maker = PrimitiveMaker("constraint string")
@@ -347,26 +395,29 @@ class NonNumericStringIo(_PrimitiveIoBuilder):
             maker = PrimitiveMaker("constant string")
             return maker.make(mystr=text)
 
-        def to_element(self):
+        def to_element(self, payloads: dict = None):
             "render default representation for constraint string"
             root = etree.Element("primitive")
             root.text = str(self.primitive)
             root.set("class", self.primitiveType.__name__)
-            myfn = dill.dumps(self.primitive.fn)
-            root.set("constraint", myfn.hex())
+            attrs = self.constraint_to_attributes(self.primitive.fn, payloads)
+            for key, value in attrs.items():
+                root.set(key, value)
             return root
 
-        def to_dict(self):
+        def to_dict(self, payloads: dict = None):
             "Default representation in python dict"
             pdict = {}
             pdict["class"] = self.primitiveType.__name__
-            pdict["constraint"] = dill.dumps(self.primitive.fn).hex()
+            pdict.update(
+                self.constraint_to_attributes(self.primitive.fn, payloads)
+            )
             pdict["type"] = "primitive"
             pdict["value"] = self.constant_string_to_dict(self.primitive)
             return pdict
 
         @classmethod
-        def from_dict(cls, cdict: dict):
+        def from_dict(cls, cdict: dict, payloads: dict = None):
             "make object from given dict"
             objclass = cdict.get("class", "")
             objtype = cdict.get("type", "")
@@ -378,7 +429,7 @@ class NonNumericStringIo(_PrimitiveIoBuilder):
             return maker.make(mystr=constr)
 
         @classmethod
-        def from_element(cls, element: etree.Element):
+        def from_element(cls, element: etree.Element, payloads: dict = None):
             ""
             elclass = element.get("class")
             eltag = element.tag
@@ -395,34 +446,17 @@ class NonNumericStringIo(_PrimitiveIoBuilder):
         def __init__(self, cstr: NonNumericString):
             super().__init__(cstr, NonNumericString)
 
-        @classmethod
-        def constant_string_to_dict(cls, conststr: NonNumericString):
-            "transform constant string of a constraint string to dict"
-            constr = conststr.cstr
-            consio = ConstantStringIo(constr)
-            ionst = consio.getIoInstance("json")
-            jstr = ionst.to_json()
-            return json.loads(jstr)
-
-        def to_dict(self):
+        def to_dict(self, payloads: dict = None):
             "Default representation in python dict"
             pdict = {}
             pdict["class"] = self.primitiveType.__name__
-            pdict["constraint"] = dill.dumps(self.primitive.fn).hex()
+            pdict.update(
+                self.constraint_to_attributes(self.primitive.fn, payloads)
+            )
             pdict["type"] = "primitive"
             pdict["value"] = self.constant_string_to_dict(self.primitive)
             return pdict
 
-        @classmethod
-        def dict_to_constant_string(cls, consdict: dict):
-            "transform dict representation to constant string"
-            consio = ConstantStringIo
-            iocls = consio.getIoClass("json")
-            constr = iocls.from_dict(consdict)
-            if not constr.isValid():
-                raise ValueError("ConstantString: " + str(constr) + " is not valid")
-            return constr
-
         @classmethod
         def from_json(cls, jsonstr: str):
             "construct object from json"
@@ -430,7 +464,7 @@ class NonNumericStringIo(_PrimitiveIoBuilder):
             return cls.from_dict(objdict)
 
         @classmethod
-        def from_dict(cls, cdict: dict):
+        def from_dict(cls, cdict: dict, payloads: dict = None):
             "make object from given dict"
             objclass = cdict.get("class", "")
             objtype = cdict.get("type", "")
@@ -0,0 +1,147 @@
+# author: Kaan Eraslan
+# license: see, LICENSE
+# purpose: streaming io for documents of primitives and pairs in xml format
+
+from suite.dtype.container import Pair
+
+from suite.io.iprimitive import ConstantStringIo
+from suite.io.iprimitive import ConstraintStringIo
+from suite.io.iprimitive import NonNumericStringIo
+
+from lxml import etree
+
+PRIMITIVE_XML_IO = {
+    "ConstantString": ConstantStringIo.getIoClass("xml"),
+    "ConstraintString": ConstraintStringIo.getIoClass("xml"),
+    "NonNumericString": NonNumericStringIo.getIoClass("xml"),
+}
+
+
+def element_to_primitive(el: etree.Element, payloads: dict = None):
+    "transform primitive element to primitive using its class"
+    elclass = el.get("class")
+    iocls = PRIMITIVE_XML_IO.get(elclass)
+    if iocls is None:
+        raise ValueError("Unknown primitive class: " + str(elclass))
+    if elclass == "ConstantString":
+        return iocls.from_element(el)
+    return iocls.from_element(el, payloads)
+
+
+def primitive_to_element(primitive, payloads: dict) -> etree.Element:
+    "transform primitive to element, constraint payloads go to payloads"
+    elclass = primitive.__class__.__name__
+    iocls = PRIMITIVE_XML_IO.get(elclass)
+    if iocls is None:
+        raise ValueError("Unknown primitive class: " + elclass)
+    if elclass == "ConstantString":
+        return iocls(primitive).to_element()
+    return iocls(primitive).to_element(payloads)
+
+
+def payload_to_element(ref: str, payload: str) -> etree.Element:
+    "transform constraint payload of document to constraint element"
+    el = etree.Element("constraint")
+    el.set("ref", ref)
+    el.text = payload
+    return el
+
+
+def members_to_pair(members: list) -> Pair:
+    "make pair from members of a pair element"
+    if len(members) != 2:
+        raise ValueError(
+            "Pair element must have 2 members, it has: " + str(len(members))
+        )
+    pair = Pair(arg1=members[0], arg2=members[1])
+    if pair.isValid() is False:
+        mess = "\n  - each argument is valid"
+        mess += "\n  - arguments are of different type"
+        raise ValueError(
+            "Pair initialized with invalid parameters. Make sure: " + mess
+        )
+    return pair
+
+
+def release_element(el: etree.Element):
+    "free processed element and its already processed previous siblings"
+    el.clear(keep_tail=True)
+    parent = el.getparent()
+    if parent is None:
+        return
+    while el.getprevious() is not None:
+        del parent[0]
+
+
+def write_xml_objects(fd, objects) -> dict:
+    """
+    Write primitives and pairs to an xml document one element at a time
+
+    fd is a file object opened in binary mode. Pickled constraints are
+    stored once per document in a constraint element, written before the
+    first element that references it, so that the document can be read
+    back with iter_xml_objects alone. Output is the payloads of the
+    document.
+    """
+    payloads = {}
+    with etree.xmlfile(fd, encoding="utf-8") as xf:
+        xf.write_declaration()
+        with xf.element("document"):
+            for obj in objects:
+                known = set(payloads)
+                if isinstance(obj, Pair):
+                    el = etree.Element("pair")
+                    el.set("class", "Pair")
+                    el.append(primitive_to_element(obj.arg1, payloads))
+                    el.append(primitive_to_element(obj.arg2, payloads))
+                else:
+                    el = primitive_to_element(obj, payloads)
+                for ref in payloads:
+                    if ref not in known:
+                        xf.write(payload_to_element(ref, payloads[ref]))
+                xf.write(el)
+    return payloads
+
+
+def iter_xml_objects(source, payloads: dict = None):
+    """
+    Yield primitives and pairs of an xml file as their elements close
+
+    source is a file path or a file object opened in binary mode. Primitive
+    elements inside a pair element become the members of that pair, other
+    primitive elements are yielded on their own. Processed elements are
+    removed from the tree, so memory does not grow with the file.
+    Constraint elements of the document are collected into payloads, which
+    resolves the constraint_ref attributes of the elements after them.
+    """
+    if payloads is None:
+        payloads = {}
+    members = []
+    context = etree.iterparse(source, events=("end",),
+                              tag=("constraint", "primitive", "pair"))
+    for _, el in context:
+        if el.tag == "constraint":
+            payloads[el.get("ref")] = el.text
+            release_element(el)
+            continue
+        if el.tag == "pair":
+            if el.get("class") != "Pair":
+                raise ValueError(
+                    "Given element class: " + str(el.get("class"))
+                    + " it must be: Pair"
+                )
+            pair = members_to_pair(members)
+            members = []
+            release_element(el)
+            yield pair
+            continue
+        primitive = element_to_primitive(el, payloads)
+        parent = el.getparent()
+        if parent is not None and parent.tag == "pair":
+            # siblings are kept until the pair closes
+            el.clear(keep_tail=True)
+            members.append(primitive)
+            continue
+        release_element(el)
+        yield primitive
+    del context
@@ -0,0 +1,181 @@
+# author: Kaan Eraslan
+# license: see, LICENSE
+# purpose: io for whole documents of structures in multiple formats
+
+from suite.dtype.container import Array
+from suite.structure import SimpleStructure
+from suite.structure import CombinedStructure
+from suite.structure import LinkStructure
+
+from lxml import etree
+import json
+
+# encoder shared by all json document writers
+DOCUMENT_ENCODER = json.JSONEncoder(ensure_ascii=False, sort_keys=True)
+
+
+def sorted_values(values: Array) -> list:
+    "strings of array elements in sorted order"
+    return sorted(map(str, values.elements))
+
+
+def values_to_dict(values: Array) -> dict:
+    "transform array of values to index object of asset documents"
+    return {str(i): value for i, value in enumerate(sorted_values(values))}
+
+
+def values_to_element(tag: str, idstr, values: Array) -> etree.Element:
+    "transform values of a relation to element with a member per value"
+    root = etree.Element(tag)
+    root.set("id", str(idstr))
+    for i, value in enumerate(sorted_values(values)):
+        member = etree.SubElement(root, "member")
+        member.set("index", str(i))
+        member.text = value
+    return root
+
+
+class _DocumentIo:
+    """
+    Base class for io of a whole document of structures
+
+    Structures are written one entry at a time to a file object, json
+    documents have the shape of asset documents.
+    """
+
+    SUPPORTED = ["xml", "json"]
+    structureType = None
+    doctype = ""
+
+    def __init__(self, structures):
+        "structures can be any iterable, they are consumed while writing"
+        self.structures = structures
+
+    def check_structure(self, structure):
+        "check if structure belongs to document"
+        if not isinstance(structure, self.structureType):
+            raise TypeError(
+                "Given structure type is: "
+                + structure.__class__.__name__
+                + " it must be: "
+                + self.structureType.__name__
+            )
+        return structure
+
+    def entry_to_dict(self, structure) -> tuple:
+        "transform structure to key and value of document entry"
+        raise NotImplementedError
+
+    def entry_to_element(self, structure) -> etree.Element:
+        "transform structure to entry element"
+        raise NotImplementedError
+
+    def write_json(self, fd):
+        "write document as json to file object opened in text mode"
+        encode = DOCUMENT_ENCODER.encode
+        iterencode = DOCUMENT_ENCODER.iterencode
+        write = fd.write
+        write("{")
+        sep = "\n"
+        for structure in self.structures:
+            key, value = self.entry_to_dict(self.check_structure(structure))
+            write(sep)
+            write(encode(key))
+            write(": ")
+            fd.writelines(iterencode(value))
+            sep = ",\n"
+        write("\n}\n")
+
+    def write_xml(self, fd):
+        "write document as xml to file object opened in binary mode"
+        with etree.xmlfile(fd, encoding="utf-8") as xf:
+            xf.write_declaration()
+            with xf.element("document", type=self.doctype):
+                for structure in self.structures:
+                    xf.write(
+                        self.entry_to_element(self.check_structure(structure))
+                    )
+
+    def write(self, fd, render_format: str):
+        "write document in given format"
+        render_format = render_format.lower()
+        if render_format == self.SUPPORTED[0]:
+            return self.write_xml(fd)
+        elif render_format == self.SUPPORTED[1]:
+            return self.write_json(fd)
+        else:
+            raise ValueError(
+                render_format
+                + " not in supported formats: "
+                + ",".join(self.SUPPORTED)
+            )
+
+    def __str__(self):
+        return "Io for " + self.doctype + " document"
+
+
+class SimpleDocumentIo(_DocumentIo):
+    "Io for a simple authority document"
+
+    structureType = SimpleStructure
+    doctype = "simple"
+
+    def entry_to_dict(self, structure: SimpleStructure) -> tuple:
+        return str(structure.idstr), {structure.value: structure.definition}
+
+    def entry_to_element(self, structure: SimpleStructure) -> etree.Element:
+        root = etree.Element("entry")
+        root.set("id", str(structure.idstr))
+        etree.SubElement(root, "value").text = structure.value
+        etree.SubElement(root, "definition").text = structure.definition
+        return root
+
+
+class CombinedDocumentIo(_DocumentIo):
+    "Io for a combined authority document"
+
+    structureType = CombinedStructure
+    doctype = "combined"
+
+    def entry_to_dict(self, structure: CombinedStructure) -> tuple:
+        value = {
+            structure.value: structure.definition,
+            str(structure.id2): values_to_dict(structure.values),
+        }
+        return str(structure.id1), value
+
+    def entry_to_element(self, structure: CombinedStructure) -> etree.Element:
+        root = etree.Element("entry")
+        root.set("id", str(structure.id1))
+        etree.SubElement(root, "value").text = structure.value
+        etree.SubElement(root, "definition").text = structure.definition
+        root.append(
+            values_to_element("relation", structure.id2, structure.values)
+        )
+        return root
+
+
+class LinkDocumentIo(_DocumentIo):
+    "Io for a link document"
+
+    structureType = LinkStructure
+    doctype = "link"
+
+    @staticmethod
+    def sorted_pairs(structure: LinkStructure) -> list:
+        "pairs of link structure in the order of their ids"
+        return sorted(structure.id2_ids, key=lambda pair: str(pair.arg1))
+
+    def entry_to_dict(self, structure: LinkStructure) -> tuple:
+        value = {
+            str(pair.arg1): values_to_dict(pair.arg2)
+            for pair in self.sorted_pairs(structure)
+        }
+        return str(structure.id1), value
+
+    def entry_to_element(self, structure: LinkStructure) -> etree.Element:
+        root = etree.Element("entry")
+        root.set("id", str(structure.id1))
+        for pair in self.sorted_pairs(structure):
+            root.append(values_to_element("relation", pair.arg1, pair.arg2))
+        return root
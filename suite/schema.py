@@ -0,0 +1,191 @@
+# author: Kaan Eraslan
+# license: see, LICENSE
+# purpose: declarative schemas for asset documents compiled into checkers
+
+"""
+Each asset document is an object whose entries share the same shape. A
+shape is described by a schema made of nodes:
+
+- "string": any string
+- "id": a string that is not only made of digits
+- "index": a string made of digits
+- an object node:
+  {"type": "object",
+   "items": [(key node, value node), ...],
+   "max_items": 2}
+  every key value pair of the object must match one of the item
+  alternatives, and the object must not have more than max_items pairs.
+
+Entry schemas describe the key and the value of a document entry, and
+name the rule that is reported when a part of the entry fails:
+
+{"key": node, "key_rule": rule name,
+ "value": object node, "rule": rule name, "type_rule": rule name,
+ "max_items_rule": rule name, "report": "item" or "object"}
+
+With report "item" each failing pair of the value is reported with its
+own value, with report "object" the whole value is reported once.
+
+Schemas are compiled once into checker functions. Valid entries only go
+through the compiled boolean predicates, detailed errors are computed only
+for failing entries.
+"""
+
+STRING = "string"
+ID = "id"
+INDEX = "index"
+
+INDEX_OBJECT = {"type": "object", "items": [(INDEX, STRING)]}
+
+SIMPLE_AUTHORITY_SCHEMA = {
+    "key": STRING,
+    "key_rule": "string_key",
+    "value": {"type": "object", "items": [(ID, STRING)], "max_items": 1},
+    "rule": "key_value_string_object",
+    "max_items_rule": "single_value_pair",
+    "report": "object",
+}
+
+COMBINED_AUTHORITY_SCHEMA = {
+    "key": STRING,
+    "key_rule": "string_key",
+    "value": {"type": "object",
+              "items": [(ID, STRING), (STRING, INDEX_OBJECT)],
+              "max_items": 2},
+    "rule": "value_string_or_int_object",
+    "type_rule": "object_value",
+    "max_items_rule": "two_value_pairs",
+    "report": "item",
+}
+
+ENTITY_PREDICATE_SCHEMA = {
+    "key": STRING,
+    "key_rule": "string_key",
+    "value": {"type": "object", "items": [(STRING, INDEX_OBJECT)]},
+    "rule": "key_value_int_object",
+    "type_rule": "object_value",
+    "report": "item",
+}
+
+LINK_SCHEMA = ENTITY_PREDICATE_SCHEMA
+
+
+def is_string(value) -> bool:
+    "check if value is a string"
+    return isinstance(value, str)
+
+
+def is_id(value) -> bool:
+    "check if value is a string that is not only made of digits"
+    return isinstance(value, str) and not value.isdigit()
+
+
+def is_index(value) -> bool:
+    "check if value is a string made of digits"
+    return isinstance(value, str) and value.isdigit()
+
+
+LEAF_CHECKERS = {STRING: is_string, ID: is_id, INDEX: is_index}
+
+
+def compile_items(node: dict):
+    "compile item alternatives of object node into a pair checker"
+    alternatives = [(compile_node(key), compile_node(value))
+                    for key, value in node["items"]]
+    if len(alternatives) == 1:
+        keyfn, valuefn = alternatives[0]
+
+        def check_pair(key, value) -> bool:
+            return keyfn(key) and valuefn(value)
+        return check_pair
+
+    def check_pair_alternatives(key, value) -> bool:
+        for keyfn, valuefn in alternatives:
+            if keyfn(key) and valuefn(value):
+                return True
+        return False
+    return check_pair_alternatives
+
+
+def compile_node(node):
+    "compile schema node into a function that outputs whether value matches"
+    if isinstance(node, str):
+        if node not in LEAF_CHECKERS:
+            raise ValueError("Unknown schema node: " + node)
+        return LEAF_CHECKERS[node]
+    if node.get("type") != "object":
+        raise ValueError("Unknown schema node: " + str(node))
+    check_pair = compile_items(node)
+    max_items = node.get("max_items")
+
+    if max_items is None:
+        def check_object(value) -> bool:
+            if not isinstance(value, dict):
+                return False
+            for key, item in value.items():
+                if not check_pair(key, item):
+                    return False
+            return True
+        return check_object
+
+    def check_sized_object(value) -> bool:
+        if not isinstance(value, dict) or len(value) > max_items:
+            return False
+        for key, item in value.items():
+            if not check_pair(key, item):
+                return False
+        return True
+    return check_sized_object
+
+
+def compile_entry_schema(schema: dict):
+    """
+    compile entry schema into a checker function
+
+    The checker takes the key and the value of an entry and outputs a list
+    of (rule, offending value, message) tuples, which is empty if the entry
+    is valid.
+    """
+    keyfn = compile_node(schema["key"])
+    node = schema["value"]
+    valuefn = compile_node(node)
+    check_pair = compile_items(node)
+    max_items = node.get("max_items")
+    rule = schema["rule"]
+    key_rule = schema.get("key_rule", rule)
+    type_rule = schema.get("type_rule", rule)
+    max_items_rule = schema.get("max_items_rule", rule)
+    report_items = schema.get("report", "item") == "item"
+
+    def diagnose(key, value) -> list:
+        "compute every error of an entry known to be invalid"
+        errors = []
+        if not keyfn(key):
+            errors.append((key_rule, key,
+                           "Key: " + str(key) + " is not valid"))
+        if not isinstance(value, dict):
+            errors.append((type_rule, value,
+                           "Value must be an object: " + str(value)))
+            return errors
+        if max_items is not None and len(value) > max_items:
+            message = "Value must not have more than "
+            message += str(max_items) + " key value pairs"
+            errors.append((max_items_rule, value, message))
+        for item_key, item_value in value.items():
+            if check_pair(item_key, item_value):
+                continue
+            message = "Key value pair failed: {0}, {1}"
+            if report_items:
+                errors.append((rule, item_value,
+                               message.format(item_key, str(item_value))))
+            else:
+                errors.append((rule, value,
+                               message.format(key, str(value))))
+                break
+        return errors
+
+    def check_entry(key, value) -> list:
+        if keyfn(key) and valuefn(value):
+            return []
+        return diagnose(key, value)
+    return check_entry
@@ -5,65 +5,105 @@ that are used for documents used by the project
 # author: Kaan Eraslan
 # license: see, LICENSE
 
+from array import array
+from itertools import accumulate
+import json
+
 from suite.dtype.primitive import NonNumericString
+from suite.dtype.primitive import PrimitiveMaker
 from suite.dtype.container import Pair
-from suite.dtype.container import NonNumericTuple
-from suite.dtype.container import UniformNonNumericMixedPair
+from suite.dtype.container import Array
+from suite.dtype.immutable import CachedHash
+
 
-from suite.dtype.container import SingleConstraintTuple
+class Structure(CachedHash):
+    """
+    Abstract class for all structure
 
+    Structures are immutable, their fields are set once in __init__.
+    Subclasses list their fields in __slots__. Since fields never change,
+    the derived frozenset and the validity of a structure are computed
+    once on first use and kept on the instance.
+    """
 
-class Structure:
-    "Abstract class for all structure"
+    __slots__ = ("_hash", "_made", "_valid")
+    cachedAttributes = ("_hash", "_made", "_valid")
 
     def __init__(self):
         pass
 
+    def __setattr__(self, name, value):
+        mess = self.__class__.__name__ + " is immutable, can not set: "
+        raise AttributeError(mess + name)
+
+    def __delattr__(self, name):
+        mess = self.__class__.__name__ + " is immutable, can not delete: "
+        raise AttributeError(mess + name)
+
     def isValidComponent(self):
         ""
         raise NotImplementedError
 
-    def isValid(self):
-        ""
+    def checkValidity(self):
+        "check if structure is valid"
         raise NotImplementedError
 
-    def make(self):
-        ""
+    def makeStructure(self):
+        "make derived frozenset of structure"
         raise NotImplementedError
 
+    def isValid(self):
+        "validity of structure computed once and kept on the instance"
+        try:
+            return self._valid
+        except AttributeError:
+            valid = self.checkValidity()
+            object.__setattr__(self, "_valid", valid)
+            return valid
+
+    def make(self):
+        "derived frozenset of structure made once and kept on the instance"
+        try:
+            return self._made
+        except AttributeError:
+            made = self.makeStructure()
+            object.__setattr__(self, "_made", made)
+            return made
+
     def __ne__(self, other):
         res = self.__eq__(other)
         if res is not NotImplemented:
             return not res
         return NotImplemented
 
-    def __hash__(self):
-        items = list(self.__dict__.items())
-        items.sort()
-        return hash(tuple(items))
+    def hashKey(self) -> tuple:
+        "values that decide equality of structure"
+        raise NotImplementedError
 
 
 class SimpleStructure(Structure):
     "Simple structure"
 
+    __slots__ = ("idstr", "value", "definition")
+
     def __init__(self, idstr: NonNumericString, value: str, definition: str):
         assert isinstance(idstr, NonNumericString)
         assert isinstance(value, str)
         assert isinstance(definition, str)
-        self.idstr = idstr
-        self.value = value
-        self.definition = definition
+        object.__setattr__(self, "idstr", idstr)
+        object.__setattr__(self, "value", value)
+        object.__setattr__(self, "definition", definition)
 
     def isValidComponent(self):
         return self.idstr.isValid()
 
-    def isValid(self):
+    def checkValidity(self):
         ntpl = self.make()
         return self.isValidComponent() and isinstance(ntpl, frozenset)
 
-    def make(self):
+    def makeStructure(self):
         "make structure"
-        pair = Pair(str1=self.value, str2=self.definition)
+        pair = Pair(arg1=self.value, arg2=self.definition)
         return frozenset((self.idstr, pair))
 
     def __str__(self):
@@ -77,30 +117,35 @@ class SimpleStructure(Structure):
             return cond1 and cond2 and cond3
         return NotImplemented
 
+    def hashKey(self) -> tuple:
+        return ("SimpleStructure", self.idstr, self.value, self.definition)
+
     def __hash__(self):
-        items = list(self.__dict__.items())
-        items.sort()
-        return hash(tuple(items))
+        return CachedHash.__hash__(self)
 
 
 class CombinedStructure(Structure):
     "Models spec structure Combined"
 
+    __slots__ = ("id1", "value", "definition", "id2", "values")
+
     def __init__(self, id1: NonNumericString,
                  value: str, definition: str,
                  id2: NonNumericString,
-                 values: NonNumericTuple):
+                 values: Array):
         assert isinstance(id1, NonNumericString)
-        self.id1 = id1
+        object.__setattr__(self, "id1", id1)
         assert isinstance(value, str)
-        self.value = value
+        object.__setattr__(self, "value", value)
         assert isinstance(definition, str)
-        self.definition = definition
+        object.__setattr__(self, "definition", definition)
         assert isinstance(id2, NonNumericString)
-        self.id2 = id2
-        assert isinstance(values, NonNumericTuple)
-        assert all([isinstance(val, NonNumericString) for val in values])
-        self.values = values
+        object.__setattr__(self, "id2", id2)
+        assert isinstance(values, Array)
+        assert all(
+            [isinstance(val, NonNumericString) for val in values.elements]
+        )
+        object.__setattr__(self, "values", values)
 
     def isValidComponent(self):
         cond1 = self.id1.isValid()
@@ -108,18 +153,22 @@ class CombinedStructure(Structure):
         cond3 = self.values.isValid()
         return cond1 and cond2 and cond3
 
-    def make(self):
+    def makeStructure(self):
         ""
-        pair = Pair(str1=self.value, str2=self.definition)
-        npair = UniformNonNumericMixedPair(str1=self.id2, strset=self.values)
+        pair = Pair(arg1=self.value, arg2=self.definition)
+        npair = Pair(arg1=self.id2, arg2=self.values)
         return frozenset((self.id1, pair, npair))
 
-    def isValid(self):
-        ""
+    def checkValidity(self):
+        """
+        check components and the id2-values pair
+
+        value and definition are both str, so their pair is not checked
+        with the different type rule of pairs.
+        """
         cond1 = self.isValidComponent()
-        tpl = self.make()
-        cond2 = all([t.isValid() for t in tpl])
-        return cond1 and cond2 and isinstance(tpl, frozenset)
+        cond2 = Pair(arg1=self.id2, arg2=self.values).isValid()
+        return cond1 and cond2 and isinstance(self.make(), frozenset)
 
     def __str__(self):
         return "Combined Structure: " + ",".join([str(e) for e in self.make()])
@@ -138,24 +187,26 @@ class CombinedStructure(Structure):
                         cond5)
         return NotImplemented
 
+    def hashKey(self) -> tuple:
+        return ("CombinedStructure", self.id1, self.value, self.definition,
+                self.id2, self.values)
+
     def __hash__(self):
-        items = list(self.__dict__.items())
-        items.sort()
-        return hash(tuple(items))
+        return CachedHash.__hash__(self)
 
 
 class LinkStructure(Structure):
     "Models spec structure Link"
 
+    __slots__ = ("id1", "id2_ids")
+
     def __init__(self, id1: NonNumericString,
                  id2_ids: frozenset):
         assert isinstance(id1, NonNumericString)
         assert isinstance(id2_ids, frozenset)
-        assert all(
-            [isinstance(p, UniformNonNumericMixedPair) for p in id2_ids]
-        )
-        self.id1 = id1
-        self.id2_ids = id2_ids
+        assert all([isinstance(p, Pair) for p in id2_ids])
+        object.__setattr__(self, "id1", id1)
+        object.__setattr__(self, "id2_ids", id2_ids)
 
     def isValidComponent(self):
         cond1 = all([p.isValid() for p in self.id2_ids])
@@ -172,11 +223,11 @@ class LinkStructure(Structure):
                 return False
         return True
 
-    def make(self):
+    def makeStructure(self):
         "make an object"
         return frozenset((self.id1, self.id2_ids))
 
-    def isValid(self):
+    def checkValidity(self):
         cond1 = self.isValidComponent()
         tpl = self.make()
         cond2 = isinstance(tpl, frozenset)
@@ -193,7 +244,130 @@ class LinkStructure(Structure):
             return cond1 and cond2
         return NotImplemented
 
+    def hashKey(self) -> tuple:
+        return ("LinkStructure", self.id1, self.id2_ids)
+
     def __hash__(self):
-        items = list(self.__dict__.items())
-        items.sort()
-        return hash(tuple(items))
+        return CachedHash.__hash__(self)
+
+
+class StringTable:
+    """
+    Strings kept in a single contiguous str with an offset array
+
+    String at row i is text[offsets[i]:offsets[i + 1]].
+    """
+
+    __slots__ = ("text", "offsets")
+
+    def __init__(self, strings: list):
+        self.text = "".join(strings)
+        self.offsets = array("q", [0])
+        self.offsets.extend(accumulate(map(len, strings)))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        if row < 0:
+            row += len(self)
+        return self.text[self.offsets[row]:self.offsets[row + 1]]
+
+    def __iter__(self):
+        text = self.text
+        offsets = self.offsets
+        for i in range(len(offsets) - 1):
+            yield text[offsets[i]:offsets[i + 1]]
+
+
+class SimpleAuthorityTable:
+    """
+    Columnar store of a whole simple authority document
+
+    Ids, values and definitions are kept as string tables, rows are found
+    with an id to row index. SimpleStructure objects are made only when a
+    row is accessed.
+    """
+
+    __slots__ = ("ids", "values", "definitions", "index")
+
+    def __init__(self, ids: list, values: list, definitions: list):
+        if not len(ids) == len(values) == len(definitions):
+            raise ValueError(
+                "Ids, values and definitions must have the same length"
+            )
+        index = {}
+        for row, idstr in enumerate(ids):
+            if idstr in index:
+                raise ValueError("Duplicate id in simple authority: " + idstr)
+            index[idstr] = row
+        self.ids = StringTable(ids)
+        self.values = StringTable(values)
+        self.definitions = StringTable(definitions)
+        self.index = index
+
+    @classmethod
+    def from_dict(cls, document: dict):
+        "make table from simple authority document"
+        ids = []
+        values = []
+        definitions = []
+        for idstr, entry in document.items():
+            if not isinstance(entry, dict) or len(entry) != 1:
+                raise ValueError(
+                    "Entry of id: " + str(idstr)
+                    + " must be an object with a single value pair"
+                )
+            for value, definition in entry.items():
+                if not isinstance(definition, str):
+                    raise ValueError(
+                        "Definition of id: " + str(idstr) + " must be a string"
+                    )
+                ids.append(idstr)
+                values.append(value)
+                definitions.append(definition)
+        return cls(ids, values, definitions)
+
+    @classmethod
+    def from_json(cls, jsonstr: str):
+        "make table from simple authority document in json"
+        return cls.from_dict(json.loads(jsonstr))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, idstr: str):
+        return idstr in self.index
+
+    def get_row(self, idstr: str) -> int:
+        "get row of id"
+        row = self.index.get(idstr)
+        if row is None:
+            raise KeyError("Unknown id in simple authority: " + str(idstr))
+        return row
+
+    def get_structure(self, row: int) -> SimpleStructure:
+        "make simple structure of row"
+        maker = PrimitiveMaker("non numeric string")
+        return SimpleStructure(
+            idstr=maker.from_string(self.ids[row]),
+            value=self.values[row],
+            definition=self.definitions[row],
+        )
+
+    def __getitem__(self, idstr: str) -> SimpleStructure:
+        return self.get_structure(self.get_row(idstr))
+
+    def __iter__(self):
+        "iterate over simple structures of rows"
+        for row in range(len(self)):
+            yield self.get_structure(row)
+
+    def to_dict(self) -> dict:
+        "render as simple authority document"
+        return {
+            idstr: {value: definition}
+            for idstr, value, definition in zip(
+                self.ids, self.values, self.definitions
+            )
+        }
@@ -5,8 +5,35 @@
 import os
 import json
 import glob
+import hashlib
+import re
 import sys
 
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from suite.idchecker import list_project_json_files
+from suite import schema
+
+VALIDATION_CACHE_NAME = "validationcache.json"
+VALIDATION_CACHE_VERSION = 2
+
+check_simple_authority_entry = schema.compile_entry_schema(
+    schema.SIMPLE_AUTHORITY_SCHEMA)
+check_combined_authority_entry = schema.compile_entry_schema(
+    schema.COMBINED_AUTHORITY_SCHEMA)
+check_entity_predicate_entry = schema.compile_entry_schema(
+    schema.ENTITY_PREDICATE_SCHEMA)
+
+
+class ValidationError(NamedTuple):
+    "Problem found in a document during validation"
+    path: str
+    key: str
+    value: object
+    rule: str
+    message: str
+
 
 def read_json(jsonpath: str) -> dict:
     "read json object from given path"
@@ -16,6 +43,122 @@ def read_json(jsonpath: str) -> dict:
     return myfile
 
 
+class JsonObjectReader:
+    """
+    Incremental reader for the top level object of a json file
+
+    Only the entry being decoded is held in memory, the rest of the file
+    is read in chunks as needed. The buffer grows geometrically when an
+    entry is larger than a chunk, so reading stays linear in entry size.
+    """
+    WHITESPACE = re.compile(r"[ \t\n\r]*")
+    NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+    # longest cut token whose error is reported before buffer end: \uXXXX
+    CUT_TAIL = 6
+
+    def __init__(self, fd, chunk_size: int = 2**16):
+        self.fd = fd
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self) -> bool:
+        "read next chunk into buffer, output False if file is exhausted"
+        if self.eof:
+            return False
+        size = max(self.chunk_size, len(self.buffer) - self.pos)
+        chunk = self.fd.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self) -> None:
+        "move position to next non whitespace character"
+        while True:
+            self.pos = self.WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self.fill():
+                return
+
+    def expect(self, chars: str) -> str:
+        "consume next non whitespace character which must be one of chars"
+        self.skip_whitespace()
+        if self.pos >= len(self.buffer):
+            raise ValueError("Unexpected end of json document, expected: "
+                             + chars)
+        char = self.buffer[self.pos]
+        if char not in chars:
+            mess = "Unexpected character: " + char + " expected: " + chars
+            raise ValueError(mess)
+        self.pos += 1
+        return char
+
+    def is_cut(self, err: json.JSONDecodeError) -> bool:
+        "check if decode error can be due to value cut at end of buffer"
+        if err.msg.startswith("Unterminated string"):
+            return True
+        return err.pos >= len(self.buffer) - self.CUT_TAIL
+
+    def decode(self):
+        "decode next json value, reading more of the file if it is cut"
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as err:
+                # malformed input fails here instead of reading until eof
+                if self.is_cut(err) and self.fill():
+                    continue
+                raise
+            if (
+                isinstance(value, (int, float))
+                and not self.eof
+                and self.NUMBER_TAIL.fullmatch(self.buffer, end)
+                and self.fill()
+            ):
+                # number like 1. or 1e might continue in the next chunk
+                continue
+            self.pos = end
+            return value
+
+    def expect_end(self) -> None:
+        "check that nothing but whitespace follows the top level object"
+        self.skip_whitespace()
+        if self.pos < len(self.buffer):
+            raise ValueError("Extra data after json document: "
+                             + self.buffer[self.pos:self.pos + 20])
+
+    def items(self):
+        "yield key value pairs of top level object in document order"
+        self.expect("{")
+        self.skip_whitespace()
+        if self.buffer[self.pos:self.pos + 1] == "}":
+            self.pos += 1
+            self.expect_end()
+            return
+        while True:
+            key = self.decode()
+            if not isinstance(key, str):
+                raise ValueError("Object key must be a string: " + str(key))
+            self.expect(":")
+            value = self.decode()
+            yield key, value
+            if self.expect(",}") == "}":
+                self.expect_end()
+                return
+
+
+def iter_json_items(jsonpath: str, chunk_size: int = 2**16):
+    "yield top level key value pairs of json object from given path"
+    assert os.path.isfile(jsonpath)
+    with open(jsonpath, "r", encoding="utf-8") as fd:
+        yield from JsonObjectReader(fd, chunk_size).items()
+
+
 def get_keys_array_from_object(obj: dict) -> dict:
     "get keys that are associated to objects from object"
     array_container = {}
@@ -106,6 +249,50 @@ def check_key_key_value_string_object(key: str, obj: dict) -> bool:
     return True
 
 
+def iter_entry_errors(checkfn, key: str, value, jsonpath: str = ""):
+    "yield errors of a document entry using compiled schema checker"
+    for rule, offending_value, message in checkfn(key, value):
+        yield ValidationError(jsonpath, key, offending_value, rule, message)
+
+
+def iter_simple_authority_entry_errors(author_key: str, author_value: dict,
+                                       jsonpath: str = ""):
+    "yield errors of a single entry of simple authority file"
+    return iter_entry_errors(check_simple_authority_entry, author_key,
+                             author_value, jsonpath)
+
+
+def iter_duplicate_key_error(key: str, value, keys: set, jsonpath: str):
+    "yield error if key is already seen in document, else mark it as seen"
+    if key in keys:
+        message = "Key: " + str(key) + " exists in document"
+        yield ValidationError(jsonpath, key, value, "unique_key", message)
+    else:
+        keys.add(key)
+
+
+def iter_document_errors(checkfn, document: dict, jsonpath: str = ""):
+    """
+    yield every structure error of document using compiled schema checker
+
+    Keys of a dict are unique, so duplicate keys can not be found here, see
+    stream_document_structure_errors for documents read from files.
+    """
+    for key, value in document.items():
+        errors = checkfn(key, value)
+        if errors:
+            for rule, offending_value, message in errors:
+                yield ValidationError(jsonpath, key, offending_value, rule,
+                                      message)
+
+
+def iter_simple_authority_structure_errors(author_file: dict,
+                                           jsonpath: str = ""):
+    "yield every structure error of simple authority file"
+    return iter_document_errors(check_simple_authority_entry, author_file,
+                                jsonpath)
+
+
 def validate_simple_authority_structure(author_file: dict) -> bool:
     """
     given a simple authority file output whether it is valid or not
@@ -122,25 +309,26 @@ def validate_simple_authority_structure(author_file: dict) -> bool:
      "simple-no-n": {"some-value": "value definition"}
      }
     """
-    keys = set()
-    for author_key, author_value in author_file.items():
-        message = "Key value string object failed: {0}, {1}"
-        message = message.format(author_key, str(author_value))
-        if not check_key_key_value_string_object(author_key, author_value):
-            return False, author_key, author_value, assumed_structure, message
-        value_length = len(author_value)
-        if value_length > 1:
-            message = "author value must not have more than one key"
-            message += " value pairs"
-            return False, author_key, author_value, assumed_structure, message
-        if author_key not in keys:
-            keys.add(author_key)
-        else:
-            message = "Key: " + author_key + " exists in document"
-            return False, author_key, author_value, assumed_structure, message
+    for error in iter_simple_authority_structure_errors(author_file):
+        return (False, error.key, error.value, assumed_structure,
+                error.message)
     return [True]
 
 
+def iter_combined_authority_entry_errors(author_key: str, author_value: dict,
+                                         jsonpath: str = ""):
+    "yield errors of a single entry of combined authority file"
+    return iter_entry_errors(check_combined_authority_entry, author_key,
+                             author_value, jsonpath)
+
+
+def iter_combined_authority_structure_errors(author_file: dict,
+                                             jsonpath: str = ""):
+    "yield every structure error of combined authority file"
+    return iter_document_errors(check_combined_authority_entry, author_file,
+                                jsonpath)
+
+
 def validate_combined_authority_structure(author_file: dict) -> bool:
     """
     given a combined authority file output whether it is valid or not
@@ -161,7 +349,6 @@ def validate_combined_authority_structure(author_file: dict) -> bool:
         }
     }
     """
-    keys = set()
     assumed_structure = """
     {
         "sample-combined-grammar-1": {
@@ -176,33 +363,25 @@ def validate_combined_authority_structure(author_file: dict) -> bool:
         }
     }
     """
-    for author_key, author_value in author_file.items():
-        value_length = len(author_value)
-        if value_length > 2:
-            message = "author value must not have more than two keys"
-            message += " value pairs"
-            return False, author_key, author_value, assumed_structure, message
-        if author_key not in keys:
-            keys.add(author_key)
-        else:
-            message = "Key: " + author_key + " exists in document"
-            return False, author_key, author_value, assumed_structure, message
-        #
-        for author_value_key, author_value_value in author_value.items():
-            first_check = check_key_value_string(author_value_key,
-                                                 author_value_value)
-            second_check = check_key_key_value_int_object(author_value_key,
-                                                          author_value_value)
-            if not (first_check or second_check):
-                #
-                message = "Author value items: key: "
-                message += str(author_value_key)
-                message += ", value: " + str(author_value_value)
-                message += "\nValue string check: " + str(first_check)
-                message += "\nValue int object check: " + str(second_check)
-                return (False, author_key,
-                        author_value, assumed_structure, message)
-        return [True]
+    for error in iter_combined_authority_structure_errors(author_file):
+        return (False, error.key, error.value, assumed_structure,
+                error.message)
+    return [True]
+
+
+def iter_entity_predicate_entry_errors(predicate_key: str,
+                                       predicate_value: dict,
+                                       jsonpath: str = ""):
+    "yield errors of a single entry of predicate, entity or link file"
+    return iter_entry_errors(check_entity_predicate_entry, predicate_key,
+                             predicate_value, jsonpath)
+
+
+def iter_entity_predicate_structure_errors(predicate_file: dict,
+                                           jsonpath: str = ""):
+    "yield every structure error of predicate, entity or link file"
+    return iter_document_errors(check_entity_predicate_entry, predicate_file,
+                                jsonpath)
 
 
 def validate_entity_predicate_structure(predicate_file: dict) -> bool:
@@ -234,18 +413,9 @@ def validate_entity_predicate_structure(predicate_file: dict) -> bool:
         }
     }
     """
-    keys = set()
-    for predicate_key, predicate_value in predicate_file.items():
-        if not isinstance(predicate_key, str):
-            return False, predicate_key, predicate_value, assumed_structure
-        for author_key, author_value_array in predicate_value.items():
-            if not check_key_key_value_int_object(author_key,
-                                                  author_value_array):
-                return False, predicate_key, predicate_value, assumed_structure
-        if predicate_key not in keys:
-            keys.add(predicate_key)
-        else:
-            return False, predicate_key, predicate_value, assumed_structure
+    for error in iter_entity_predicate_structure_errors(predicate_file):
+        return (False, error.key, error.value, assumed_structure,
+                error.message)
     return [True]
 
 
@@ -296,34 +466,93 @@ def check_entity_predicate_link_file_structure(
                          filetype="Entity Predicate Link Document")
 
 
+def as_id_set(ids) -> frozenset:
+    "make hashed id set from given ids unless they are already hashed"
+    if isinstance(ids, (set, frozenset, dict)):
+        return ids
+    return frozenset(ids)
+
+
+def iter_combined_authority_entry_content_errors(author_key: str,
+                                                 author_value: dict,
+                                                 simple_ids: frozenset,
+                                                 jsonpath: str = ""):
+    "yield unknown ids referenced by an entry of combined authority file"
+    array_container = get_keys_array_from_object(author_value)
+    for key, array_obj in array_container.items():
+        if key not in simple_ids:
+            message = "Key: " + key + " not in id list."
+            yield ValidationError(jsonpath, author_key, key,
+                                  "known_id", message)
+        for value in array_obj.values():
+            if value not in simple_ids:
+                message = "Value: " + value + " not in id list "
+                yield ValidationError(jsonpath, author_key, value,
+                                      "known_id", message)
+
+
+def iter_combined_authority_content_errors(author_file: dict,
+                                           simple_ids: frozenset,
+                                           jsonpath: str = ""):
+    "yield every unknown id referenced by combined authority file"
+    simple_ids = as_id_set(simple_ids)
+    for author_key, author_value in author_file.items():
+        yield from iter_combined_authority_entry_content_errors(
+            author_key, author_value, simple_ids, jsonpath)
+
+
 def validate_combined_authority_content(author_file: dict,
-                                        simple_ids: list) -> bool:
+                                        simple_ids: frozenset) -> bool:
     "validate combined authority files using simple ids"
-    assumed_structure = """
-    {
-        "combined-id-n": {
-            "value": "value definition",
-            "simple-id-no-1": {
-                "0": "simple-no-0"
-            }
-        }
-    }
-    """
-    for author_key, author_value in author_file.items():
-        array_container = get_keys_array_from_object(author_value)
-        for key, array_obj in array_container.items():
-            if key not in simple_ids:
-                message = "Key: " + key + " not in id list."
-                return False, author_key, author_value, message
-            for value in array_obj.values():
-                if value not in simple_ids:
-                    message = "Value: " + value + " not in id list "
-                    return False, author_key, author_value, message
+    for error in iter_combined_authority_content_errors(author_file,
+                                                        simple_ids):
+        return False, error.key, error.value, error.message
     return [True]
 
 
+def iter_entity_predicate_entry_content_errors(predicate_key: str,
+                                               predicate_value: dict,
+                                               simple_combined_ids: frozenset,
+                                               keys,
+                                               jsonpath: str = ""):
+    "yield unknown ids referenced by an entry of predicate or entity file"
+    for key, array_obj in predicate_value.items():
+        if key not in simple_combined_ids:
+            message = "Key: " + key + " not in id list."
+            yield ValidationError(jsonpath, predicate_key, key,
+                                  "known_id", message)
+        for value in array_obj.values():
+            first_check = value not in simple_combined_ids
+            second_check = value not in keys
+            cond = first_check and second_check
+            if cond:
+                message = "Value: " + value + ""
+                message += "\nCondition: " + str(cond)
+                message += "\nValue not in ids: " + str(first_check)
+                message += "\nValue not in keys: " + str(second_check)
+                yield ValidationError(jsonpath, predicate_key, value,
+                                      "known_id", message)
+
+
+def iter_entity_predicate_content_errors(entity_predicate_file: dict,
+                                         simple_combined_ids: frozenset,
+                                         jsonpath: str = ""):
+    """
+    yield every unknown id referenced by predicate or entity file
+
+    Values may refer either to simple/combined ids or to keys of the
+    document itself.
+    """
+    simple_combined_ids = as_id_set(simple_combined_ids)
+    keys = entity_predicate_file
+    for predicate_key, predicate_value in entity_predicate_file.items():
+        yield from iter_entity_predicate_entry_content_errors(
+            predicate_key, predicate_value, simple_combined_ids, keys,
+            jsonpath)
+
+
 def validate_entity_predicate_content(entity_predicate_file: dict,
-                                      simple_combined_ids: list) -> list:
+                                      simple_combined_ids: frozenset) -> list:
     "validate predicate file content"
     assumed_structure = """
     {   "entity/predicate-1": {"another-simple-id-no-0": {"0": "simple-id-no-1"}},
@@ -339,39 +568,49 @@ def validate_entity_predicate_content(entity_predicate_file: dict,
         }
     }
     """
-    keys = list(entity_predicate_file.keys())
-    for predicate_key, predicate_value in entity_predicate_file.items():
-        for key, array_obj in predicate_value.items():
-            if key not in simple_combined_ids:
-                message = "Key: " + key + " not in id list."
-                return False, predicate_key, predicate_value, message
-            for value in array_obj.values():
-                first_check = value not in simple_combined_ids
-                second_check = value not in keys
-                cond = first_check and second_check
-                if cond:
-                    message = "Value: " + value + ""
-                    message += "\nCondition: " + str(cond)
-                    message += "\nValue not in ids: " + str(first_check)
-                    message += "\nValue not in keys: " + str(second_check)
-                    return False, predicate_key, predicate_value, message
+    for error in iter_entity_predicate_content_errors(entity_predicate_file,
+                                                      simple_combined_ids):
+        return False, error.key, error.value, error.message
     return [True]
 
 
+def iter_entity_predicate_link_entry_content_errors(
+        entity_id: str, link_values: dict, simple_combined_ids: frozenset,
+        predicate_ids: frozenset, jsonpath: str = ""):
+    "yield unknown ids referenced by an entry of entity predicate link file"
+    for authority_id, predicates in link_values.items():
+        if authority_id not in simple_combined_ids:
+            message = "Authority id: " + authority_id + " not in id list."
+            yield ValidationError(jsonpath, entity_id, authority_id,
+                                  "known_id", message)
+        for predicate in predicates.values():
+            if predicate not in predicate_ids:
+                message = "Predicate value: " + predicate
+                message += " not in available predicate ids"
+                yield ValidationError(jsonpath, entity_id, predicate,
+                                      "known_predicate_id", message)
+
+
+def iter_entity_predicate_link_content_errors(link_file: dict,
+                                              simple_combined_ids: frozenset,
+                                              predicate_ids: frozenset,
+                                              jsonpath: str = ""):
+    "yield every unknown id referenced by entity predicate link file"
+    simple_combined_ids = as_id_set(simple_combined_ids)
+    predicate_ids = as_id_set(predicate_ids)
+    for entity_id, link_values in link_file.items():
+        yield from iter_entity_predicate_link_entry_content_errors(
+            entity_id, link_values, simple_combined_ids, predicate_ids,
+            jsonpath)
+
+
 def validate_entity_predicate_link_content(link_file: dict,
-                                           simple_combined_ids: list,
-                                           predicate_ids: list) -> list:
+                                           simple_combined_ids: frozenset,
+                                           predicate_ids: frozenset) -> list:
     "validate entity predicate link file content"
-    for entity_id, link_values in link_file.items():
-        for authority_id, predicates in link_values.items():
-            if authority_id not in simple_combined_ids:
-                message = "Authority id: " + authority_id + " not in id list."
-                return False, entity_id, link_values, message
-            for predicate in predicates.values():
-                if predicate not in predicate_ids:
-                    message = "Predicate value: " + predicate
-                    message += " not in available predicate ids"
-                    return False, entity_id, link_values, message
+    for error in iter_entity_predicate_link_content_errors(
+            link_file, simple_combined_ids, predicate_ids):
+        return False, error.key, error.value, error.message
     return [True]
 
 
@@ -386,3 +625,321 @@ def check_content_proc(checkfn: lambda x: x,
         mess += ".\nSee also the assumed file structure: " + check[3]
         mess += "\nSee the message of validation function: " + check[4]
         raise ValueError(mess)
+
+
+DOCUMENT_TYPES = {
+    "simple": "simple",
+    "author": "combined",
+    "predicate": "predicate",
+    "entity": "entity",
+    "link": "link",
+}
+
+STRUCTURE_VALIDATORS = {
+    "simple": iter_simple_authority_structure_errors,
+    "combined": iter_combined_authority_structure_errors,
+    "predicate": iter_entity_predicate_structure_errors,
+    "entity": iter_entity_predicate_structure_errors,
+    "link": iter_entity_predicate_structure_errors,
+}
+
+
+def list_project_documents(project_path: str) -> list:
+    "list document type and path of each document in project assets"
+    documents = []
+    for asset_type, jsonpath in list_project_json_files(project_path):
+        documents.append((DOCUMENT_TYPES[asset_type], jsonpath))
+    return documents
+
+
+ENTRY_STRUCTURE_VALIDATORS = {
+    "simple": iter_simple_authority_entry_errors,
+    "combined": iter_combined_authority_entry_errors,
+    "predicate": iter_entity_predicate_entry_errors,
+    "entity": iter_entity_predicate_entry_errors,
+    "link": iter_entity_predicate_entry_errors,
+}
+
+
+def stream_document_structure_errors(doctype: str, jsonpath: str,
+                                     chunk_size: int = 2**16,
+                                     ids: list = None):
+    """
+    yield structure errors of document reading one entry at a time
+
+    Memory is bounded by the largest entry of the document and by the set
+    of its ids, which is kept for detecting duplicate keys. Unlike
+    json.load, keys repeated in the file are reported. If a list is given
+    as ids, keys of the document are appended to it in document order.
+    """
+    entryfn = ENTRY_STRUCTURE_VALIDATORS[doctype]
+    keys = set()
+    for key, value in iter_json_items(jsonpath, chunk_size):
+        if ids is not None:
+            ids.append(key)
+        yield from entryfn(key, value, jsonpath)
+        yield from iter_duplicate_key_error(key, value, keys, jsonpath)
+
+
+def stream_document_content_errors(doctype: str, jsonpath: str,
+                                   id_sets: dict, chunk_size: int = 2**16):
+    "yield content errors of document reading one entry at a time"
+    items = iter_json_items(jsonpath, chunk_size)
+    if doctype == "combined":
+        for key, value in items:
+            yield from iter_combined_authority_entry_content_errors(
+                key, value, id_sets["simple"], jsonpath)
+    elif doctype == "predicate" or doctype == "entity":
+        # values may refer to keys of the document, so collect them first
+        keys = frozenset(key for key, value in items)
+        for key, value in iter_json_items(jsonpath, chunk_size):
+            yield from iter_entity_predicate_entry_content_errors(
+                key, value, id_sets["simple_combined"], keys, jsonpath)
+    elif doctype == "link":
+        for key, value in items:
+            yield from iter_entity_predicate_link_entry_content_errors(
+                key, value, id_sets["simple_combined"], id_sets["predicate"],
+                jsonpath)
+
+
+def validate_document_structure(doctype: str, jsonpath: str,
+                                stream: bool = False):
+    """
+    validate structure of document and output all its errors and its ids
+
+    Ids are the keys of the document, even if some of its entries are
+    malformed, so that references to them are not reported as unknown.
+    No ids are output only if the document can not be read.
+    """
+    try:
+        if stream:
+            ids = []
+            errors = list(stream_document_structure_errors(doctype,
+                                                           jsonpath,
+                                                           ids=ids))
+        else:
+            document = read_json(jsonpath)
+            iterfn = STRUCTURE_VALIDATORS[doctype]
+            errors = list(iterfn(document, jsonpath))
+            ids = list(document.keys())
+    except (ValueError, AttributeError, TypeError) as err:
+        message = "Document can not be read as " + doctype + " document: "
+        message += str(err)
+        return [ValidationError(path=jsonpath, key=None, value=None,
+                                rule="readable_document",
+                                message=message)], []
+    return errors, ids
+
+
+def make_id_sets(ids: dict) -> dict:
+    "make id sets used by content validation from ids of each document type"
+    id_sets = {}
+    id_sets["simple"] = frozenset(ids["simple"])
+    id_sets["simple_combined"] = frozenset(ids["simple"] | ids["combined"])
+    id_sets["predicate"] = frozenset(ids["predicate"])
+    return id_sets
+
+
+def validate_document_content(doctype: str, jsonpath: str,
+                              id_sets: dict, stream: bool = False) -> list:
+    "validate cross references of document using id sets of project"
+    if stream:
+        return list(stream_document_content_errors(doctype, jsonpath,
+                                                   id_sets))
+    document = read_json(jsonpath)
+    if doctype == "combined":
+        errors = iter_combined_authority_content_errors(
+            document, id_sets["simple"], jsonpath)
+    elif doctype == "predicate" or doctype == "entity":
+        errors = iter_entity_predicate_content_errors(
+            document, id_sets["simple_combined"], jsonpath)
+    elif doctype == "link":
+        errors = iter_entity_predicate_link_content_errors(
+            document, id_sets["simple_combined"], id_sets["predicate"],
+            jsonpath)
+    else:
+        return []
+    return list(errors)
+
+
+def validate_project(project_path: str, max_workers=None,
+                     stream: bool = False) -> list:
+    """
+    validate all documents of project and output every error found
+
+    Structure of documents are validated in parallel over a process pool.
+    Cross references of structurally valid documents are then validated
+    against the ids defined in the project. Output is an empty list if the
+    project is valid. If stream is True documents are read one entry at a
+    time instead of being loaded whole, which suits very large documents.
+    """
+    documents = list_project_documents(project_path)
+    doctypes = [doctype for doctype, jsonpath in documents]
+    jsonpaths = [jsonpath for doctype, jsonpath in documents]
+    streams = [stream] * len(documents)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        checks = list(executor.map(validate_document_structure,
+                                   doctypes, jsonpaths, streams))
+    errors = []
+    ids = {doctype: set() for doctype in STRUCTURE_VALIDATORS}
+    valid_documents = []
+    for (doctype, jsonpath), (doc_errors, doc_ids) in zip(documents, checks):
+        errors.extend(doc_errors)
+        ids[doctype].update(doc_ids)
+        if not doc_errors:
+            valid_documents.append((doctype, jsonpath))
+    id_sets = make_id_sets(ids)
+    for doctype, jsonpath in valid_documents:
+        errors.extend(validate_document_content(doctype, jsonpath, id_sets,
+                                                stream))
+    return errors
+
+
+def get_validation_cache_path(project_path: str) -> str:
+    "get path of validation cache which is stored in project directory"
+    return os.path.join(project_path, VALIDATION_CACHE_NAME)
+
+
+def read_validation_cache(project_path: str) -> dict:
+    "read validation cache of project, return empty cache if not usable"
+    cache = {"version": VALIDATION_CACHE_VERSION, "files": {}}
+    cache_path = get_validation_cache_path(project_path)
+    if not os.path.isfile(cache_path):
+        return cache
+    try:
+        stored = read_json(cache_path)
+    except ValueError:
+        return cache
+    if stored.get("version") != VALIDATION_CACHE_VERSION:
+        return cache
+    return stored
+
+
+def write_validation_cache(project_path: str, cache: dict) -> None:
+    "write validation cache to project directory"
+    cache_path = get_validation_cache_path(project_path)
+    with open(cache_path, "w", encoding="utf-8") as fd:
+        json.dump(cache, fd, ensure_ascii=False)
+
+
+def hash_file(jsonpath: str) -> str:
+    "compute sha256 digest of file content"
+    digest = hashlib.sha256()
+    with open(jsonpath, "rb") as fd:
+        for chunk in iter(lambda: fd.read(2**16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_document_references(document: dict) -> set:
+    "get ids referenced by combined, predicate, entity or link document"
+    references = set()
+    for value in document.values():
+        array_container = get_keys_array_from_object(value)
+        for key, array_obj in array_container.items():
+            references.add(key)
+            references.update(array_obj.values())
+    return references
+
+
+def get_cached_ids(files: dict) -> dict:
+    "get ids of each document type from cache entries"
+    ids = {doctype: set() for doctype in STRUCTURE_VALIDATORS}
+    for entry in files.values():
+        ids[entry["doctype"]].update(entry["ids"])
+    return ids
+
+
+def get_changed_ids(old_ids: dict, new_ids: dict) -> set:
+    "get ids that are added to or removed from any document type"
+    changed = set()
+    for doctype in new_ids:
+        changed.update(old_ids[doctype] ^ new_ids[doctype])
+    return changed
+
+
+def validate_project_incremental(project_path: str,
+                                 max_workers=None) -> list:
+    """
+    validate project reusing results of unchanged documents
+
+    A cache in the project directory records, for each document, the
+    sha256 digest of its content, its errors, the ids it defines and the
+    ids it references. Structure is validated again only for documents
+    whose digest has changed. Content is validated again for changed
+    documents and for documents referencing an id whose definition has
+    been added or removed since the last run. Output has the same errors
+    as validate_project, grouped by document: structure errors of a
+    document are followed by its content errors.
+
+    cache structure
+    {"version": 2,
+     "files": {"assets/link/link1.json": {
+        "doctype": "link", "hash": "sha256 digest",
+        "structure_errors": [], "content_errors": [],
+        "ids": ["entity-1"], "references": ["relation-1", "predicate-1"]}}
+    }
+    """
+    old_files = read_validation_cache(project_path)["files"]
+    files = {}
+    changed = []
+    for doctype, jsonpath in list_project_documents(project_path):
+        relpath = os.path.relpath(jsonpath, project_path)
+        digest = hash_file(jsonpath)
+        entry = old_files.get(relpath)
+        if (entry is not None and entry["hash"] == digest
+                and entry["doctype"] == doctype):
+            files[relpath] = entry
+            continue
+        files[relpath] = {"doctype": doctype, "hash": digest,
+                          "structure_errors": [], "content_errors": [],
+                          "ids": [], "references": []}
+        changed.append((relpath, doctype, jsonpath))
+    #
+    doctypes = [doctype for relpath, doctype, jsonpath in changed]
+    jsonpaths = [jsonpath for relpath, doctype, jsonpath in changed]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        checks = list(executor.map(validate_document_structure,
+                                   doctypes, jsonpaths))
+    for (relpath, doctype, jsonpath), (doc_errors, doc_ids) in zip(changed,
+                                                                  checks):
+        files[relpath]["structure_errors"] = [list(e) for e in doc_errors]
+        files[relpath]["ids"] = doc_ids
+    #
+    new_ids = get_cached_ids(files)
+    changed_ids = get_changed_ids(get_cached_ids(old_files), new_ids)
+    changed_paths = set(relpath for relpath, doctype, jsonpath in changed)
+    id_sets = make_id_sets(new_ids)
+    for relpath, entry in files.items():
+        if entry["structure_errors"]:
+            continue
+        if (relpath not in changed_paths
+                and changed_ids.isdisjoint(entry["references"])):
+            continue
+        jsonpath = os.path.join(project_path, relpath)
+        if relpath in changed_paths and entry["doctype"] != "simple":
+            references = get_document_references(read_json(jsonpath))
+            entry["references"] = sorted(references)
+        doc_errors = validate_document_content(entry["doctype"], jsonpath,
+                                               id_sets)
+        entry["content_errors"] = [list(e) for e in doc_errors]
+    write_validation_cache(project_path,
+                           {"version": VALIDATION_CACHE_VERSION,
+                            "files": files})
+    errors = []
+    for entry in files.values():
+        for error in entry["structure_errors"] + entry["content_errors"]:
+            errors.append(ValidationError(*error))
+    return errors
+
+
+if __name__ == "__main__":
+    project_path = input("Enter project path: ")
+    errors = validate_project(project_path)
+    for error in errors:
+        print(error.path, ":", error.key, ":", error.message)
+    if errors:
+        print(len(errors), "errors found in project")
+        sys.exit(1)
+    print("project is valid")
+    sys.exit(0)
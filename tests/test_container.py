@@ -5,6 +5,7 @@
 import unittest
 import os
 import pdb
+import pickle
 
 from suite.dtype.container import Pair, Array
 from suite.dtype.container import ContainerMaker
@@ -63,6 +64,53 @@ class TestContainer(unittest.TestCase):
         self.assertTrue(check, "either value or type error should have been triggered")
 
 
+    def test_pair_array_hash(self):
+        mystr1 = self.consMaker.make(mystr="mystr1")
+        mystr2 = self.nnmaker.from_string(mystr="mystr2")
+        mystr3 = self.consMaker.make(mystr="mystr3")
+        pair1 = Pair(arg1=mystr1, arg2=mystr2)
+        pair2 = Pair(arg1=ConstantString("mystr1"), arg2=mystr2)
+        self.assertEqual(hash(pair1), hash(pair2))
+        self.assertEqual(len({pair1, pair2}), 1)
+        arr1 = Array([mystr1, mystr3])
+        arr2 = Array([mystr3, mystr1])
+        self.assertEqual(hash(arr1), hash(arr2))
+        self.assertNotEqual(hash(arr1), hash(Array([mystr1])))
+
+    def test_pair_array_slots(self):
+        "pairs and arrays are immutable and have no instance dict"
+        mystr1 = self.consMaker.make(mystr="mystr1")
+        mystr2 = self.nnmaker.from_string(mystr="mystr2")
+        pair = Pair(arg1=mystr1, arg2=mystr2)
+        arr = Array([mystr1, self.consMaker.make(mystr="mystr3")])
+        self.assertFalse(hasattr(pair, "__dict__"))
+        self.assertFalse(hasattr(arr, "__dict__"))
+        check = False
+        try:
+            arr.elements = frozenset()
+        except AttributeError:
+            check = True
+        self.assertTrue(check)
+        myhash = hash(arr)
+        arr2 = pickle.loads(pickle.dumps(arr))
+        self.assertEqual(arr2, arr)
+        self.assertEqual(hash(arr2), myhash)
+        self.assertEqual(pickle.loads(pickle.dumps(pair)), pair)
+
+    def test_array_single_pass(self):
+        "array accepts generators and reports invalid elements"
+        strs = ["mystr" + str(i) for i in range(5)]
+        arr = Array(self.consMaker.make(mystr=s) for s in strs)
+        self.assertEqual(arr, Array([ConstantString(s) for s in strs]))
+        self.assertTrue(str(arr).startswith("Array: "))
+        mystrs = [NonNumericString(ConstantString(s))
+                  for s in ["word-1", "12", "word-2", "1.5"]]
+        try:
+            Array(iter(mystrs))
+            mess = ""
+        except ValueError as err:
+            mess = str(err)
+        self.assertEqual(mess, "Array contains invalid objects: 12 1.5")
 
 
 if __name__ == "__main__":
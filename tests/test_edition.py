@@ -3,14 +3,18 @@
 # purpose: test scripts of suite
 
 import unittest
+from unittest import mock
 
 from suite import idchecker as idc
 from suite import projectMaker as pjm
 from suite import validator as vd
+from suite import schema as sch
 
 import os
+import io
 import json
 import shutil
+import tempfile
 import pdb
 
 
@@ -213,6 +217,15 @@ class TestDigitalEditionSuite(unittest.TestCase):
         check = vd.validate_combined_authority_structure(doc1)
         self.assertEqual(check[0], True)
 
+    def test_validate_combined_authority_structure_all_entries(self):
+        ""
+        doc1 = vd.read_json(self.combined_doc_path)
+        doc1["sample-combined-grammar-3"] = {
+            "value": "", "sample-relation-2": {"a": "sample-grammar-1"}}
+        check = vd.validate_combined_authority_structure(doc1)
+        self.assertEqual(check[0], False)
+        self.assertEqual(check[1], "sample-combined-grammar-3")
+
     def test_validate_predicate_entity_link_structure(self):
         ""
         doc1 = vd.read_json(self.predicate_doc_path)
@@ -276,6 +289,301 @@ class TestDigitalEditionSuite(unittest.TestCase):
         self.assertEqual(True, check1[0])
         self.assertEqual(False, check2[0])
 
+    def make_sample_project(self, parent: str):
+        "make sample project in given parent directory"
+        (simple_dir, author_dir,
+         entity_dir, link_dir, predicate_dir) = pjm.mk_project_dirs(
+            parent,
+            self.project_name)
+        pjm.make_samples_proc(simple_dir, author_dir,
+                              predicate_dir, entity_dir, link_dir)
+        return os.path.join(parent, self.project_name)
+
+    def test_check_id_in_project(self):
+        ""
+        with tempfile.TemporaryDirectory() as parent:
+            project_path = self.make_sample_project(parent)
+            check1 = idc.check_id_in_project(project_path, "sample-word-2")
+            check2 = idc.check_id_in_project(project_path, "sample-word-9")
+            simple_path = os.path.join(project_path, "assets", "predicate",
+                                       "authority", "simple",
+                                       "sampleSimple.json")
+            self.assertEqual(check1, (True, "simple", simple_path))
+            self.assertEqual(check2[0], False)
+            index_path = idc.get_id_index_path(project_path)
+            self.assertTrue(os.path.isfile(index_path))
+
+    def test_id_index_invalidation(self):
+        ""
+        with tempfile.TemporaryDirectory() as parent:
+            project_path = self.make_sample_project(parent)
+            idc.update_id_index(project_path)
+            link_dir = idc.build_project_structure(project_path)["link"]
+            link_path = os.path.join(link_dir,
+                                     "sampleEntityPredicateLink.json")
+            pjm.write_to_json(link_path, {"sample-entity-9": {}})
+            stamp = os.stat(link_path)
+            os.utime(link_path, ns=(stamp.st_atime_ns,
+                                    stamp.st_mtime_ns + 10**9))
+            check1 = idc.check_id_in_project(project_path, "sample-entity-9")
+            self.assertEqual(check1, (True, "link", link_path))
+            os.remove(link_path)
+            check2 = idc.check_id_in_project(project_path, "sample-entity-9")
+            self.assertEqual(check2[0], False)
+
+    def test_id_lookup_cached(self):
+        "lookup is built again only when asset files change"
+        with tempfile.TemporaryDirectory() as parent:
+            project_path = self.make_sample_project(parent)
+            with mock.patch.object(idc, "read_id_index",
+                                   wraps=idc.read_id_index) as read_index:
+                lookup = idc.load_id_lookup(project_path)
+                self.assertTrue(idc.load_id_lookup(project_path) is lookup)
+                idc.check_id_in_project(project_path, "sample-word-2")
+                self.assertEqual(read_index.call_count, 1)
+                link_dir = idc.build_project_structure(project_path)["link"]
+                link_path = os.path.join(link_dir,
+                                         "sampleEntityPredicateLink.json")
+                pjm.write_to_json(link_path, {"sample-entity-9": {}})
+                stamp = os.stat(link_path)
+                os.utime(link_path, ns=(stamp.st_atime_ns,
+                                        stamp.st_mtime_ns + 10**9))
+                check = idc.check_id_in_project(project_path,
+                                                "sample-entity-9")
+                self.assertEqual(check, (True, "link", link_path))
+                self.assertEqual(read_index.call_count, 2)
+
+    def test_check_ids_in_project(self):
+        ""
+        with tempfile.TemporaryDirectory() as parent:
+            project_path = self.make_sample_project(parent)
+            idpath = os.path.join(parent, "ids.txt")
+            with open(idpath, "w", encoding="utf-8") as fd:
+                fd.write("sample-entity-1\n\nsample-new-1\n")
+            checks = idc.check_id_file_in_project(project_path, idpath)
+            link_dir = idc.build_project_structure(project_path)["link"]
+            link_path = os.path.join(link_dir,
+                                     "sampleEntityPredicateLink.json")
+            self.assertEqual(set(checks), {"sample-entity-1", "sample-new-1"})
+            self.assertEqual(checks["sample-entity-1"],
+                             (True, "link", link_path))
+            self.assertEqual(checks["sample-new-1"], [False])
+
+    def test_find_duplicate_ids(self):
+        ""
+        with tempfile.TemporaryDirectory() as parent:
+            project_path = self.make_sample_project(parent)
+            self.assertEqual(idc.find_duplicate_ids(project_path), {})
+            entity_dir = idc.build_project_structure(project_path)["entity"]
+            entity_path = os.path.join(entity_dir, "duplicates.json")
+            with open(entity_path, "w", encoding="utf-8") as fd:
+                fd.write('{"sample-word-1": {}, "sample-entity-3": {},'
+                         ' "sample-entity-3": {}}')
+            duplicates = idc.find_duplicate_ids(project_path)
+            self.assertEqual(set(duplicates),
+                             {"sample-word-1", "sample-entity-3"})
+            self.assertEqual(duplicates["sample-entity-3"],
+                             [("entity", entity_path),
+                              ("entity", entity_path)])
+            self.assertEqual(len(duplicates["sample-word-1"]), 2)
+
+    def make_asset_project(self, parent: str):
+        "make project in given parent directory using test assets"
+        (simple_dir, author_dir,
+         entity_dir, link_dir, predicate_dir) = pjm.mk_project_dirs(
+            parent,
+            self.project_name)
+        shutil.copy(self.simple_doc1_path, simple_dir)
+        shutil.copy(self.simple_doc2_path, simple_dir)
+        shutil.copy(self.simple_doc3_path, simple_dir)
+        shutil.copy(self.combined_doc_path, author_dir)
+        shutil.copy(self.predicate_doc_path, predicate_dir)
+        shutil.copy(self.entity_doc_path, entity_dir)
+        shutil.copy(self.link_doc_path, link_dir)
+        return os.path.join(parent, self.project_name)
+
+    def test_validate_project(self):
+        ""
+        with tempfile.TemporaryDirectory() as parent:
+            project_path = self.make_asset_project(parent)
+            self.assertEqual(vd.validate_project(project_path), [])
+            link_dir = idc.build_project_structure(project_path)["link"]
+            bad_path = os.path.join(link_dir, "bad.json")
+            pjm.write_to_json(bad_path, {
+                "sample-entity-1": {"sample-relation-3": {"0": "nowhere"}}
+            })
+            entity_dir = idc.build_project_structure(project_path)["entity"]
+            broken_path = os.path.join(entity_dir, "broken.json")
+            pjm.write_to_json(broken_path, {
+                "sample-entity-3": {"sample-relation-1": {"a": "b"}}
+            })
+            errors = vd.validate_project(project_path, max_workers=2)
+            self.assertEqual(len(errors), 2)
+            self.assertEqual(
+                {(error.path, error.rule) for error in errors},
+                {(broken_path, "key_value_int_object"),
+                 (bad_path, "known_predicate_id")})
+
+    def test_validate_project_keeps_ids_of_malformed_document(self):
+        "one bad entry does not make references to its document unknown"
+        with tempfile.TemporaryDirectory() as parent:
+            project_path = self.make_asset_project(parent)
+            simple_dir = idc.build_project_structure(project_path)["simple"]
+            simple_path = os.path.join(simple_dir, "simple3.json")
+            doc = vd.read_json(simple_path)
+            doc["sample-relation-1"] = {"equals": "", "is": ""}
+            pjm.write_to_json(simple_path, doc)
+            expected = [(simple_path, "sample-relation-1",
+                         "single_value_pair")]
+            for errors in [vd.validate_project(project_path),
+                           vd.validate_project(project_path, stream=True),
+                           vd.validate_project_incremental(project_path)]:
+                self.assertEqual(
+                    [(error.path, error.key, error.rule)
+                     for error in errors], expected)
+
+    def test_iter_structure_errors(self):
+        ""
+        doc = {"simple-1": {"0": "zero"},
+               "simple-2": {"a": "b", "c": "d"},
+               "simple-3": {"lorem": ""}}
+        errors = list(vd.iter_simple_authority_structure_errors(doc,
+                                                                "doc.json"))
+        self.assertEqual(
+            [(error.path, error.key, error.rule) for error in errors],
+            [("doc.json", "simple-1", "key_value_string_object"),
+             ("doc.json", "simple-2", "single_value_pair")])
+        check = vd.validate_simple_authority_structure(doc)
+        self.assertEqual(check[0], False)
+        self.assertEqual(check[1], "simple-1")
+
+    def test_iter_content_errors(self):
+        ""
+        doc1 = vd.read_json(self.predicate_doc_path)
+        ids = ["sample-relation-3", "sample-combined-grammar-2",
+               "sample-grammar-7", "sample-relation-1"]
+        errors = list(vd.iter_entity_predicate_content_errors(doc1, ids))
+        self.assertEqual([error.value for error in errors],
+                         ["sample-grammar-5", "sample-word-3"])
+
+    def test_iter_json_items(self):
+        ""
+        for path in [self.simple_doc1_path, self.combined_doc_path,
+                     self.predicate_doc_path, self.link_doc_path]:
+            items = list(vd.iter_json_items(path, chunk_size=3))
+            self.assertEqual(items, list(vd.read_json(path).items()))
+
+    def test_json_object_reader_numbers(self):
+        "numbers cut at chunk boundaries are read whole"
+        doc = {"a": {"x": 1.5e-3, "y": [12.25, -3, 1E+10, 0.5]},
+               "b": "h\u00e9llo \"q\"", "c": [True, None, -0.0, 1234567]}
+        for text in [json.dumps(doc), json.dumps(doc, ensure_ascii=False)]:
+            for chunk_size in range(1, 12):
+                reader = vd.JsonObjectReader(io.StringIO(text), chunk_size)
+                self.assertEqual(dict(reader.items()), doc)
+
+    def test_json_object_reader_malformed(self):
+        "malformed entry fails without reading rest of file"
+        fd = io.StringIO('{"a": [1, 2 x' + " " * 10**5 + "}")
+        check = False
+        try:
+            list(vd.JsonObjectReader(fd, 16).items())
+        except ValueError:
+            check = True
+        self.assertTrue(check)
+        self.assertTrue(fd.tell() < 100)
+        for text in ['{"sample-word-1": {"a": ""}} trailing garbage',
+                     '{} {}']:
+            check = False
+            try:
+                list(vd.JsonObjectReader(io.StringIO(text), 4).items())
+            except ValueError:
+                check = True
+            self.assertTrue(check)
+        with tempfile.TemporaryDirectory() as parent:
+            path = os.path.join(parent, "simple.json")
+            with open(path, "w", encoding="utf-8") as fd:
+                fd.write('{"sample-word-1": {"a": ""}} trailing garbage\n')
+            for stream in [False, True]:
+                errors, ids = vd.validate_document_structure(
+                    "simple", path, stream=stream)
+                self.assertEqual([error.rule for error in errors],
+                                 ["readable_document"])
+                self.assertEqual(ids, [])
+
+    def test_validate_document_structure_stream(self):
+        "ids are collected while validating the file once"
+        with mock.patch.object(vd, "iter_json_items",
+                               wraps=vd.iter_json_items) as items:
+            errors, ids = vd.validate_document_structure(
+                "simple", self.simple_doc1_path, stream=True)
+        self.assertEqual(errors, [])
+        self.assertEqual(ids, list(vd.read_json(self.simple_doc1_path)))
+        self.assertEqual(items.call_count, 1)
+
+    def test_stream_document_structure_errors(self):
+        ""
+        with tempfile.TemporaryDirectory() as parent:
+            path = os.path.join(parent, "simple.json")
+            with open(path, "w", encoding="utf-8") as fd:
+                fd.write('{"simple-1": {"0": "zero"}, "simple-2": 25,'
+                         ' "simple-3": {"lorem": ""},'
+                         ' "simple-3": {"ipsum": ""}}')
+            errors = list(vd.stream_document_structure_errors(
+                "simple", path, chunk_size=4))
+            self.assertEqual(
+                [(error.key, error.rule) for error in errors],
+                [("simple-1", "key_value_string_object"),
+                 ("simple-2", "key_value_string_object"),
+                 ("simple-3", "unique_key")])
+
+    def test_validate_project_stream(self):
+        ""
+        with tempfile.TemporaryDirectory() as parent:
+            project_path = self.make_asset_project(parent)
+            self.assertEqual(vd.validate_project(project_path, stream=True),
+                             [])
+
+    def test_validate_project_incremental(self):
+        ""
+        with tempfile.TemporaryDirectory() as parent:
+            project_path = self.make_asset_project(parent)
+            errors = vd.validate_project_incremental(project_path)
+            self.assertEqual(errors, [])
+            cache_path = vd.get_validation_cache_path(project_path)
+            self.assertTrue(os.path.isfile(cache_path))
+            simple_dir = idc.build_project_structure(project_path)["simple"]
+            simple_path = os.path.join(simple_dir, "simple2.json")
+            doc = vd.read_json(simple_path)
+            doc.pop("sample-grammar-5")
+            pjm.write_to_json(simple_path, doc)
+            errors = vd.validate_project_incremental(project_path)
+            predicate_dir = idc.build_project_structure(
+                project_path)["predicate"]
+            predicate_path = os.path.join(predicate_dir, "predicate1.json")
+            self.assertEqual(
+                [(error.path, error.value) for error in errors],
+                [(predicate_path, "sample-grammar-5")])
+            self.assertEqual(vd.validate_project(project_path), errors)
+            shutil.copy(self.simple_doc2_path, simple_dir)
+            self.assertEqual(vd.validate_project_incremental(project_path),
+                             [])
+
+    def test_compile_entry_schema(self):
+        ""
+        check_entry = sch.compile_entry_schema(sch.COMBINED_AUTHORITY_SCHEMA)
+        self.assertEqual(check_entry("combined-1", {
+            "value": "", "relation-1": {"0": "simple-1"}}), [])
+        errors = check_entry("combined-1", {
+            "value": "", "relation-1": {"a": "simple-1"}, "other": ""})
+        self.assertEqual([error[0] for error in errors],
+                         ["two_value_pairs", "value_string_or_int_object"])
+        self.assertEqual(errors[1][1], {"a": "simple-1"})
+        check_value = sch.compile_node(sch.INDEX_OBJECT)
+        self.assertTrue(check_value({"0": "a", "12": "b"}))
+        self.assertFalse(check_value({"0": "a", "b": "b"}))
+        self.assertFalse(check_value(["a"]))
+
 
 if __name__ == "__main__":
     unittest.main()
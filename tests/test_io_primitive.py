@@ -12,9 +12,15 @@ import dill
 
 from suite.dtype.primitive import ConstraintString, NonNumericString
 from suite.dtype.primitive import ConstantString
+from suite.dtype.primitive import PrimitiveMaker
+from suite.dtype.primitive import get_validation_counts
+from suite.dtype.primitive import reset_validation_counts
+from suite.dtype.primitive import register_constraint
+from suite.dtype.primitive import nonNumeric
 from suite.io.iprimitive import ConstraintStringIo
 from suite.io.iprimitive import NonNumericStringIo
 from suite.io.iprimitive import ConstantStringIo
+from suite.io.iprimitive import load_constraint
 
 
 class TestIoIPrimitive(unittest.TestCase):
@@ -130,7 +136,7 @@ class TestIoIPrimitive(unittest.TestCase):
         nnstrio = NonNumericStringIo(self.mynnstr)
         ioinst = nnstrio.getIoInstance("xml")
         default = ioinst.to_element()
-        cmpel = etree.Element("primitive", constraint=self.mynnfn.hex())
+        cmpel = etree.Element("primitive", constraint_name="nonNumeric")
         cmpel.set("class", "NonNumericString")
         cmpel.text = str(self.mynnstr)
         self.assertEqual(default.text, cmpel.text)
@@ -148,7 +154,7 @@ class TestIoIPrimitive(unittest.TestCase):
         cmpd["class"] = "NonNumericString"
         cmpd["type"] = "primitive"
         cmpd["value"] = json.loads(consjson)
-        cmpd["constraint"] = self.mynnfn.hex()
+        cmpd["constraint_name"] = "nonNumeric"
         reprstr = json.dumps(cmpd, ensure_ascii=False, indent=2, sort_keys=True)
         self.assertEqual(default, reprstr)
         self.assertEqual(dicrepr, cmpd)
@@ -176,6 +182,71 @@ class TestIoIPrimitive(unittest.TestCase):
         nnstr = xmlio.from_element(cmpel)
         self.assertEqual(nnstr, self.mynnstr)
 
+    def test_non_numeric_string_validated_once_per_load(self):
+        ""
+        ioinst = NonNumericStringIo(self.mynnstr).getIoInstance("json")
+        jsonstr = ioinst.to_json()
+        jio = NonNumericStringIo.getIoClass("json")
+        PrimitiveMaker.pool.clear()
+        reset_validation_counts()
+        nnstr = jio.from_json(jsonstr)
+        NonNumericStringIo(nnstr).getIoInstance("json").to_dict()
+        self.assertEqual(nnstr, self.mynnstr)
+        self.assertEqual(get_validation_counts(),
+                         {"ConstantString": 1, "NonNumericString": 1})
+
+    def test_xml_io_dict_round_trip(self):
+        "xml io of constraint and non numeric strings render nested dicts"
+        for primitive, iocls in [(self.mycstr, ConstraintStringIo),
+                                 (self.mynnstr, NonNumericStringIo)]:
+            ioinst = iocls(primitive).getIoInstance("xml")
+            pdict = ioinst.to_dict()
+            self.assertEqual(pdict["value"], {
+                "class": "ConstantString",
+                "type": "primitive",
+                "value": str(primitive),
+            })
+            self.assertEqual(iocls.getIoClass("xml").from_dict(pdict),
+                             primitive)
+
+    def test_constraint_registry(self):
+        "registered constraints are referenced by name"
+        ioinst = ConstraintStringIo(self.mycstr).getIoInstance("json")
+        payloads = {}
+        pdicts = [ioinst.to_dict(payloads), ioinst.to_dict(payloads)]
+        self.assertEqual(len(payloads), 1)
+        self.assertFalse("constraint" in pdicts[0])
+        self.assertEqual(pdicts[0]["constraint_ref"],
+                         pdicts[1]["constraint_ref"])
+        jio = ConstraintStringIo.getIoClass("json")
+        self.assertEqual(jio.from_dict(pdicts[0], payloads), self.mycstr)
+        cstr = ConstraintString(ConstantString("word"), nonNumeric)
+        cdict = ConstraintStringIo(cstr).getIoInstance("json").to_dict()
+        self.assertEqual(cdict["constraint_name"], "nonNumeric")
+        self.assertEqual(jio.from_dict(cdict), cstr)
+        xmlio = ConstraintStringIo.getIoClass("xml")
+        element = ConstraintStringIo(cstr).getIoInstance("xml").to_element()
+        self.assertEqual(xmlio.from_element(element), cstr)
+        register_constraint(nonNumeric)
+        check = False
+        try:
+            register_constraint(self.mycstr.fn, "nonNumeric")
+        except ValueError:
+            check = True
+        self.assertTrue(check)
+
+    def test_constraint_cache(self):
+        "legacy constraint payloads are unpickled once"
+        load_constraint.cache_clear()
+        xmlio = ConstraintStringIo.getIoClass("xml")
+        for i in range(5):
+            cmpel = etree.Element("primitive", constraint=self.myfn.hex())
+            cmpel.set("class", "ConstraintString")
+            cmpel.text = "my valid constraint string " + str(i)
+            xmlio.from_element(cmpel)
+        info = load_constraint.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (4, 1, 1))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,109 @@
+# author: Kaan Eraslan
+# license: see, LICENSE
+# purpose: test scripts of suite
+
+import unittest
+import io
+import os
+import tempfile
+
+from lxml import etree
+
+from suite.dtype.primitive import ConstantString
+from suite.dtype.primitive import ConstraintString
+from suite.dtype.primitive import NonNumericString
+from suite.dtype.primitive import nonNumeric
+from suite.dtype.container import Pair
+from suite.io.iprimitive import ConstantStringIo
+from suite.io.iprimitive import ConstraintStringIo
+from suite.io.iprimitive import NonNumericStringIo
+from suite.io.istream import iter_xml_objects
+from suite.io.istream import release_element
+from suite.io.istream import write_xml_objects
+
+
+def lowercase(x: ConstantString) -> bool:
+    "constraint that is not registered, so it is pickled"
+    return x.constr.islower()
+
+
+class TestIoStream(unittest.TestCase):
+    "test io stream module"
+
+    def setUp(self):
+        "setup small data"
+        self.myconstr = ConstantString("my valid constant string")
+        self.mycstr = ConstraintString(ConstantString("word"), nonNumeric)
+        self.mynnstr = NonNumericString(
+            ConstantString("my valid non numeric string")
+        )
+        self.mypair = Pair(arg1=self.myconstr, arg2=self.mynnstr)
+
+    def to_element(self, primitive, iocls):
+        return iocls(primitive).getIoInstance("xml").to_element()
+
+    def mk_document(self) -> bytes:
+        "make xml document with primitives and a pair"
+        root = etree.Element("document")
+        root.append(self.to_element(self.myconstr, ConstantStringIo))
+        root.append(self.to_element(self.mycstr, ConstraintStringIo))
+        pair = etree.SubElement(root, "pair")
+        pair.set("class", "Pair")
+        pair.append(self.to_element(self.myconstr, ConstantStringIo))
+        pair.append(self.to_element(self.mynnstr, NonNumericStringIo))
+        root.append(self.to_element(self.mynnstr, NonNumericStringIo))
+        return etree.tostring(root, encoding="utf-8")
+
+    def test_iter_xml_objects(self):
+        "objects are yielded in document order"
+        objs = list(iter_xml_objects(io.BytesIO(self.mk_document())))
+        self.assertEqual(
+            objs, [self.myconstr, self.mycstr, self.mypair, self.mynnstr]
+        )
+
+    def test_release_element(self):
+        "processed elements are removed from the tree"
+        root = etree.fromstring(self.mk_document())
+        last = root[-1]
+        release_element(last)
+        self.assertEqual(len(root), 1)
+        self.assertTrue(root[0] is last)
+        self.assertEqual(len(last.attrib), 0)
+
+    def test_write_xml_objects(self):
+        "pickled constraint is stored once and read back from the file"
+        lowers = [ConstraintString(ConstantString(s), lowercase)
+                  for s in ["lorem", "ipsum", "dolor"]]
+        objs = lowers + [self.mypair, self.mycstr, self.mynnstr]
+        with tempfile.TemporaryDirectory() as parent:
+            path = os.path.join(parent, "document.xml")
+            with open(path, "wb") as fd:
+                payloads = write_xml_objects(fd, objs)
+            self.assertEqual(len(payloads), 1)
+            root = etree.parse(path).getroot()
+            self.assertEqual(len(root.findall("constraint")), 1)
+            self.assertEqual(root[0].tag, "constraint")
+            self.assertEqual(root[1].get("constraint_ref"), root[0].get("ref"))
+            self.assertEqual(root.findall("primitive[@constraint]"), [])
+            objs2 = list(iter_xml_objects(path))
+        self.assertEqual(objs2, objs)
+        self.assertTrue(all(o.isValid() for o in objs2[:3]))
+
+    def test_iter_xml_objects_invalid_pair(self):
+        "pair of same types is not valid"
+        root = etree.Element("document")
+        pair = etree.SubElement(root, "pair")
+        pair.set("class", "Pair")
+        pair.append(self.to_element(self.myconstr, ConstantStringIo))
+        pair.append(self.to_element(self.myconstr, ConstantStringIo))
+        source = io.BytesIO(etree.tostring(root, encoding="utf-8"))
+        check = False
+        try:
+            list(iter_xml_objects(source))
+        except ValueError:
+            check = True
+        self.assertTrue(check)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# author: Kaan Eraslan
+# license: see, LICENSE
+# purpose: test scripts of suite
+
+import unittest
+import os
+import io
+import json
+
+from lxml import etree
+
+from suite.dtype.primitive import PrimitiveMaker
+from suite.dtype.container import Pair
+from suite.dtype.container import Array
+from suite.structure import SimpleAuthorityTable
+from suite.structure import LinkStructure
+from suite.structure import CombinedStructure
+from suite.io.istructure import SimpleDocumentIo
+from suite.io.istructure import LinkDocumentIo
+from suite.io.istructure import CombinedDocumentIo
+
+
+class TestIoStructure(unittest.TestCase):
+    "test io structure module"
+
+    def setUp(self):
+        self.currentdir = os.path.abspath(os.curdir)
+        self.testdir = os.path.join(self.currentdir, "tests")
+        self.assetdir = os.path.join(self.testdir, "assets")
+        self.nnmaker = PrimitiveMaker("non numeric string")
+
+    def test_simple_document_json(self):
+        "simple document is written in the shape of asset documents"
+        with open(os.path.join(self.assetdir, "simple1.json"), "r",
+                  encoding="utf-8") as fd:
+            document = json.load(fd)
+        table = SimpleAuthorityTable.from_dict(document)
+        fd = io.StringIO()
+        SimpleDocumentIo(iter(table)).write(fd, "json")
+        self.assertEqual(json.loads(fd.getvalue()), document)
+
+    def test_link_document_xml(self):
+        "link document is written as a single xml document"
+        mystr = self.nnmaker.from_string
+        pair = Pair(arg1=mystr("relation-1"),
+                    arg2=Array([mystr("word-2"), mystr("word-1")]))
+        link = LinkStructure(mystr("entity-1"), frozenset([pair]))
+        self.assertTrue(link.isValid())
+        fd = io.BytesIO()
+        LinkDocumentIo([link]).write(fd, "xml")
+        root = etree.fromstring(fd.getvalue())
+        self.assertEqual(root.get("type"), "link")
+        members = root.findall("entry/relation/member")
+        self.assertEqual([m.text for m in members], ["word-1", "word-2"])
+        fd = io.StringIO()
+        LinkDocumentIo([link]).write(fd, "json")
+        self.assertEqual(json.loads(fd.getvalue()), {
+            "entity-1": {"relation-1": {"0": "word-1", "1": "word-2"}}
+        })
+
+    def test_combined_document(self):
+        "combined document in json and xml"
+        mystr = self.nnmaker.from_string
+        cstruct = CombinedStructure(
+            id1=mystr("sample-combined-1"), value="value 1",
+            definition="definition 1", id2=mystr("sample-relation-1"),
+            values=Array([mystr("sample-grammar-2"),
+                          mystr("sample-grammar-1")]))
+        self.assertTrue(cstruct.isValid())
+        fd = io.StringIO()
+        CombinedDocumentIo([cstruct]).write(fd, "json")
+        self.assertEqual(json.loads(fd.getvalue()), {
+            "sample-combined-1": {
+                "value 1": "definition 1",
+                "sample-relation-1": {"0": "sample-grammar-1",
+                                      "1": "sample-grammar-2"},
+            }
+        })
+        fd = io.BytesIO()
+        CombinedDocumentIo(iter([cstruct])).write(fd, "xml")
+        root = etree.fromstring(fd.getvalue())
+        self.assertEqual(root.find("entry/value").text, "value 1")
+        self.assertEqual(root.find("entry/relation").get("id"),
+                         "sample-relation-1")
+        check = False
+        try:
+            LinkDocumentIo([cstruct]).write(io.StringIO(), "json")
+        except TypeError:
+            check = True
+        self.assertTrue(check)
+
+
+if __name__ == "__main__":
+    unittest.main()
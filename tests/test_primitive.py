@@ -10,6 +10,11 @@ from suite.dtype.primitive import PrimitiveMaker
 from suite.dtype.primitive import ConstantString
 from suite.dtype.primitive import NonNumericString
 from suite.dtype.primitive import ConstraintString
+from suite.dtype.primitive import isNonNumericText
+from suite.dtype.primitive import nonNumeric
+from suite.dtype.primitive import get_invalid_utf8_indices
+from suite.dtype.primitive import get_validation_counts
+from suite.dtype.primitive import reset_validation_counts
 
 
 class TestPrimitive(unittest.TestCase):
@@ -168,6 +173,138 @@ class TestPrimitive(unittest.TestCase):
             check = True
         self.assertEqual(True, check)
 
+    def test_non_numeric_text(self):
+        "fast path and numeric fallback of non numeric classification"
+        numerics = ["123", "1_000", "\u0661\u0662", " 12 ", "nan", "-inf",
+                    "Infinity", "1e5", "(1+2j)", "1/2", "123.45"]
+        nonnumerics = ["sample-word-1", "", "fan", "1.2.3", "12a"]
+        for text in numerics:
+            self.assertFalse(isNonNumericText(text), text)
+        for text in nonnumerics:
+            self.assertTrue(isNonNumericText(text), text)
+
+    def test_primitive_maker_interning(self):
+        "same string and constraint give the same primitive"
+        pmaker = PrimitiveMaker("non numeric string")
+        nnstr1 = pmaker.from_string(mystr="sample-word-1")
+        nnstr2 = pmaker.from_string(mystr="sample-word-1")
+        nnstr3 = pmaker.from_string(mystr="sample-word-2")
+        self.assertIs(nnstr1, nnstr2)
+        self.assertIs(nnstr1.cstr, nnstr2.cstr)
+        self.assertIsNot(nnstr1, nnstr3)
+        cmaker = PrimitiveMaker("constraint string")
+
+        def lfn(x: ConstantString):
+            return x.constr.islower()
+
+        def ufn(x: ConstantString):
+            return x.constr.islower()
+
+        cstr1 = cmaker.from_string(mystr="sample-word-1", fnc=lfn)
+        cstr2 = cmaker.from_string(mystr="sample-word-1", fnc=ufn)
+        self.assertIsNot(cstr1, cstr2)
+        self.assertIs(cstr1, cmaker.from_string(mystr="sample-word-1",
+                                                fnc=lfn))
+
+    def test_primitive_hash(self):
+        "equal primitives hash equal, different values hash differently"
+        import pickle
+
+        myconstr1 = ConstantString("sample-word-1")
+        myconstr2 = ConstantString("sample-word-1")
+        myconstr3 = ConstantString("sample-word-2")
+        self.assertEqual(hash(myconstr1), hash(myconstr2))
+        self.assertNotEqual(hash(myconstr1), hash(myconstr3))
+        nnstr1 = NonNumericString(myconstr1)
+        nnstr3 = NonNumericString(myconstr3)
+        self.assertEqual(len({nnstr1, NonNumericString(myconstr2), nnstr3}),
+                         2)
+        self.assertNotIn("_hash", pickle.loads(pickle.dumps(nnstr1)).__dict__)
+
+    def test_validate_once(self):
+        "primitives made by maker are validated once"
+        PrimitiveMaker.pool.clear()
+        reset_validation_counts()
+        pmaker = PrimitiveMaker("non numeric string")
+        nnstr = pmaker.from_string(mystr="validated-once-1")
+        self.assertTrue(nnstr.isValidated())
+        self.assertTrue(nnstr.cstr.isValidated())
+        nnstr.isValid()
+        pmaker.make(mystr=nnstr.cstr)
+        self.assertEqual(get_validation_counts(),
+                         {"ConstantString": 1, "NonNumericString": 1})
+        self.assertFalse(NonNumericString(ConstantString("123")).isValid())
+        self.assertFalse(
+            NonNumericString(ConstantString("123")).isValidated())
+
+    def test_primitive_maker_from_strings(self):
+        "make primitives in bulk and report rejected strings"
+        pmaker = PrimitiveMaker("non numeric string")
+        strs = ["sample-word-a", "123", "sample-word-b", 5, "sample-word-a"]
+        made, rejected = pmaker.from_strings(strs)
+        self.assertEqual([str(n) for n in made],
+                         ["sample-word-a", "sample-word-b", "sample-word-a"])
+        self.assertTrue(made[0] is made[2])
+        self.assertEqual([(r[0], r[1]) for r in rejected], [(1, "123"), (3, 5)])
+        made, rejected = PrimitiveMaker.from_type_strings(
+            ConstraintString, (s for s in ["sample-a", "2.5"]), fnc=nonNumeric
+        )
+        self.assertEqual(made, [
+            PrimitiveMaker("constraint string").from_string(
+                "sample-a", fnc=nonNumeric)
+        ])
+        self.assertEqual(len(rejected), 1)
+        check = False
+        try:
+            pmaker.from_type_strings(ConstraintString, ["a"], fnc=lambda x: x)
+        except ValueError:
+            check = True
+        self.assertTrue(check)
+
+    def test_invalid_utf8_indices(self):
+        "find strings that can not be encoded as utf-8 in a batch"
+        strs = ["sample", "\ud800", "ğüşçö", "a\udfffb", "\ud83d\ude00"]
+        self.assertEqual(get_invalid_utf8_indices(strs), [1, 3, 4])
+        self.assertEqual(get_invalid_utf8_indices(strs[:1] + strs[2:3]), [])
+        self.assertEqual(get_invalid_utf8_indices([1, "\ud800"]), [1])
+        self.assertFalse(ConstantString("\ud800").isValid())
+        self.assertTrue(ConstantString("ğüşçö").isValid())
+        made, rejected = PrimitiveMaker("constant string").from_strings(strs)
+        self.assertEqual([str(m) for m in made], ["sample", "ğüşçö"])
+        self.assertTrue(all(m.isValidated() for m in made))
+        self.assertEqual([r[0] for r in rejected], [1, 3, 4])
+
+    def test_invalid_string_not_pooled_as_valid(self):
+        "an invalid string never comes out of the pool marked valid"
+        PrimitiveMaker.pool.clear()
+        cmaker = PrimitiveMaker("constant string")
+        for maker in [lambda: cmaker.make(mystr="\ud800"),
+                      lambda: cmaker.from_string("\ud800"),
+                      lambda: PrimitiveMaker("non numeric string").from_string(
+                          "a\udfff")]:
+            check = False
+            try:
+                maker()
+            except ValueError:
+                check = True
+            self.assertTrue(check)
+        made, rejected = cmaker.from_strings(["\ud800", "a\udfff"])
+        self.assertEqual(made, [])
+        self.assertEqual(len(rejected), 2)
+        self.assertEqual(len(PrimitiveMaker.pool), 0)
+        check = False
+        try:
+            cmaker.make_constant_string("\ud800", checked=True)
+        except TypeError:
+            check = True
+        self.assertTrue(check)
+        check = False
+        try:
+            cmaker.from_string("\ud800")
+        except ValueError:
+            check = True
+        self.assertTrue(check)
+
 
 if __name__ == "__main__":
     unittest.main()
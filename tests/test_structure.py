@@ -5,15 +5,19 @@
 import unittest
 import os
 import pdb
+import json
+import pickle
 
-from suite.dtype.primitive import NonNumericString
-from suite.dtype.container import SingleConstraintTuple
-from suite.dtype.container import NonNumericTuple
-from suite.dtype.container import UniformNonNumericMixedPair
+from unittest import mock
+
+from suite.dtype.primitive import PrimitiveMaker
+from suite.dtype.container import Pair
+from suite.dtype.container import Array
 
 from suite.structure import SimpleStructure
 from suite.structure import CombinedStructure
 from suite.structure import LinkStructure
+from suite.structure import SimpleAuthorityTable
 
 
 class TestModel(unittest.TestCase):
@@ -23,67 +27,110 @@ class TestModel(unittest.TestCase):
         self.currentdir = os.path.abspath(os.curdir)
         self.testdir = os.path.join(self.currentdir, "tests")
         self.assetdir = os.path.join(self.testdir, "assets")
+        self.nnmaker = PrimitiveMaker("non numeric string")
+
+    def mk_array(self, *strs) -> Array:
+        "make array of non numeric strings"
+        return Array([self.nnmaker.from_string(s) for s in strs])
 
     def test_simple_structure(self):
         "simple structure"
-        idstr = NonNumericString("My String 2")
+        idstr = self.nnmaker.from_string("My String 2")
         value = "𐎠𐎭𐎠 𐏐 𐏃𐎹"
         definition = "adā : hya"
         ss = SimpleStructure(idstr=idstr,
                              value=value,
                              definition=definition)
         self.assertEqual(True, ss.isValid())
+        self.assertTrue(Pair(arg1=value, arg2=definition) in ss.make())
 
     def test_combined_structure(self):
         "combined structure"
-        idstr = NonNumericString("my-string-2")
+        idstr = self.nnmaker.from_string("my-string-2")
         value = "𐎠𐎭𐎠 𐏐 𐏃𐎹"
         definition = "adā : hya"
-        id2 = NonNumericString("relation-2")
-        mystr1 = NonNumericString("word-1")
-        mystr2 = NonNumericString("word-2")
-        mystr3 = NonNumericString("word-3")
-        mset = frozenset([mystr1, mystr2, mystr3])
-        tpl = NonNumericTuple(mset)
+        id2 = self.nnmaker.from_string("relation-2")
+        tpl = self.mk_array("word-1", "word-2", "word-3")
         cstruct = CombinedStructure(id1=idstr,
                                     value=value,
                                     definition=definition,
                                     id2=id2,
                                     values=tpl)
         self.assertEqual(True, cstruct.isValid())
+        self.assertTrue(Pair(arg1=id2, arg2=tpl) in cstruct.make())
 
     def test_link_structure(self):
         ""
-        idstr = NonNumericString("my-string-2")
-        id2a = NonNumericString("relation-2")
-        mystr1 = NonNumericString("word-1")
-        mystr2 = NonNumericString("word-2")
-        mystr3 = NonNumericString("word-3")
-        mset = frozenset([mystr1, mystr2, mystr3])
-        tpl1 = NonNumericTuple(mset)
-        p1 = UniformNonNumericMixedPair(id2a,
-                                        tpl1)
-        id2b = NonNumericString("relation-3")
-        mystr4 = NonNumericString("word-4")
-        mystr5 = NonNumericString("word-5")
-        mystr6 = NonNumericString("word-6")
-        mset = frozenset([mystr1, mystr2, mystr3])
-        tpl2 = NonNumericTuple(mset)
-        p2 = UniformNonNumericMixedPair(id2b,
-                                        tpl2)
+        idstr = self.nnmaker.from_string("my-string-2")
+        id2a = self.nnmaker.from_string("relation-2")
+        tpl1 = self.mk_array("word-1", "word-2", "word-3")
+        p1 = Pair(id2a, tpl1)
+        id2b = self.nnmaker.from_string("relation-3")
+        tpl2 = self.mk_array("word-4", "word-5", "word-6")
+        p2 = Pair(id2b, tpl2)
         link1 = LinkStructure(idstr,
                               frozenset([p1, p2]))
         self.assertEqual(True, link1.isValid())
-        id2c = NonNumericString("relation-3")
-        mystr6 = NonNumericString("word-7")
-        mset = frozenset([mystr1, mystr2, mystr6])
-        tpl2 = NonNumericTuple(mset)
-        p3 = UniformNonNumericMixedPair(id2c,
-                                        tpl2)
+        id2c = self.nnmaker.from_string("relation-3")
+        tpl3 = self.mk_array("word-1", "word-2", "word-7")
+        p3 = Pair(id2c, tpl3)
         link2 = LinkStructure(idstr,
                               frozenset([p1, p2, p3]))
         self.assertEqual(False, link2.isValid())
 
+    def test_structure_made_once(self):
+        "derived frozenset and validity are computed once"
+        idstr = self.nnmaker.from_string("my-string-2")
+        pair = Pair(self.nnmaker.from_string("relation-2"),
+                    self.mk_array("word-1", "word-2"))
+        link = LinkStructure(idstr, frozenset([pair]))
+        with mock.patch.object(LinkStructure, "checkValidity",
+                               autospec=True,
+                               side_effect=LinkStructure.checkValidity
+                               ) as check:
+            made = link.make()
+            self.assertTrue(made is link.make())
+            str(link)
+            self.assertTrue(made is link.make())
+            self.assertEqual(made, frozenset((idstr, frozenset([pair]))))
+            self.assertTrue(link.isValid())
+            self.assertTrue(link.isValid())
+            self.assertEqual(check.call_count, 1)
+        link2 = pickle.loads(pickle.dumps(link))
+        self.assertEqual(link2, link)
+        self.assertFalse(link2.make() is made)
+        self.assertEqual(link2.make(), made)
+
+    def test_simple_authority_table(self):
+        "columnar store of simple authority file"
+        with open(os.path.join(self.assetdir, "simple1.json"), "r",
+                  encoding="utf-8") as fd:
+            document = json.load(fd)
+        table = SimpleAuthorityTable.from_dict(document)
+        self.assertEqual(len(table), 5)
+        self.assertTrue("sample-word-3" in table)
+        self.assertFalse("sample-word-6" in table)
+        ss = table["sample-word-3"]
+        self.assertEqual(str(ss.idstr), "sample-word-3")
+        self.assertEqual(ss.value, "dolor")
+        self.assertEqual(ss.definition, "")
+        self.assertTrue(ss.isValid())
+        self.assertTrue(Pair(arg1="dolor", arg2="") in ss.make())
+        self.assertEqual(ss, SimpleStructure(
+            self.nnmaker.from_string("sample-word-3"), "dolor", ""))
+        self.assertTrue(all(s.isValid() for s in table))
+        self.assertEqual([s.value for s in table],
+                         ["lorem", "ipsum", "dolor", "sit", "amet"])
+        self.assertEqual(table.to_dict(), document)
+        check = False
+        try:
+            SimpleAuthorityTable.from_dict(
+                {"sample-word-1": {"a": "", "b": ""}}
+            )
+        except ValueError:
+            check = True
+        self.assertTrue(check)
+
 
 if __name__ == "__main__":
     unittest.main()